@@ -1,13 +1,27 @@
 # backend/api.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from feast import FeatureStore
+from starlette.concurrency import run_in_threadpool
+from feast_utils import get_feast_store
+from sklearn.ensemble import RandomForestRegressor
+from xgboost import XGBRegressor
+from cachetools import TTLCache, cached
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import hashlib
+import hmac
+import threading
 import joblib
+import numpy as np
 import pandas as pd
 import os
-import json
+import orjson
+import warnings
 
-app = FastAPI()
+# orjson serializes the float-heavy responses much faster than stdlib json
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -17,10 +31,54 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-store = FeatureStore(repo_path="feature_repo")
+store = get_feast_store()
 
+LOCATION_ID = "islamabad_us_embassy"
+
+# Online features shown on the dashboard
+CURRENT_AQI_FEATURES = (
+    "aqi_features:aqi",
+    "aqi_features:pm25",
+    "aqi_features:dominant_pollutant",
+    "aqi_features:temp",
+    "aqi_features:humidity",
+    "aqi_features:pressure",
+    "aqi_features:wind_speed",
+    "aqi_features:dew"
+)
+
+# Online features needed to build the prediction input
+PREDICT_FEATURES = (
+    "aqi_features:temp",
+    "aqi_features:humidity",
+    "aqi_features:pressure",
+    "aqi_features:wind_speed",
+    "aqi_features:dew",
+    "aqi_features:pm25",
+    "aqi_features:hour",
+    "aqi_features:day",
+    "aqi_features:month",
+    "aqi_features:year",
+    "aqi_features:day_of_week",
+    "aqi_features:aqi_change",
+    "aqi_features:aqi_roll3"
+)
+
+# Exact feature columns (and order) used during training
+TRAINING_FEATURES = (
+    'hour', 'day_of_week', 'month', 'year',
+    'temp', 'humidity', 'pressure', 'wind_speed', 'dew', 'pm25'
+)
+
+@functools.lru_cache(maxsize=1)
 def load_active_models():
-    """Load active models using _latest.pkl files for smart deployment"""
+    """Load active models using _latest.pkl files for smart deployment
+    
+    mmap_mode='r' only maps plain numpy arrays stored in the pickle. sklearn
+    trees copy their node arrays into their own memory when unpickled, and
+    XGBoost restores its booster from a raw byte blob, so every worker process
+    still holds a private copy of each model.
+    """
     try:
         models = {}
         
@@ -36,17 +94,23 @@ def load_active_models():
             latest_path = f"models/aqi_predictor_{horizon}_{model_type}_latest.pkl"
             
             if os.path.exists(latest_path):
-                models[horizon] = joblib.load(latest_path)
+                models[horizon] = joblib.load(latest_path, mmap_mode='r')
                 print(f"✅ Loaded active {horizon} model from {latest_path}")
             else:
                 # Fallback: try loading non-versioned file
                 fallback_path = f"models/aqi_predictor_{horizon}_{model_type}.pkl"
                 if os.path.exists(fallback_path):
-                    models[horizon] = joblib.load(fallback_path)
+                    models[horizon] = joblib.load(fallback_path, mmap_mode='r')
                     print(f"⚠️  Fallback: Loaded {horizon} model from {fallback_path} (no _latest.pkl)")
                 else:
                     print(f"❌ ERROR: No model found for {horizon} (tried {latest_path} and {fallback_path})")
         
+        # Serving predicts one row at a time, where spinning up XGBoost's OpenMP team
+        # costs more than the traversal itself; parallelism comes from PREDICT_POOL
+        for model in models.values():
+            if isinstance(model, XGBRegressor):
+                model.set_params(n_jobs=1)
+        
         return models
     
     except Exception as e:
@@ -58,145 +122,278 @@ def load_active_models():
 # Load all trained models (using _latest.pkl for active deployment)
 models = load_active_models()
 
+def compile_forest(model):
+    """Flatten a fitted RandomForestRegressor into padded (n_trees, n_nodes) arrays"""
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    n_nodes = max(tree.node_count for tree in trees)
+    
+    def stack(arrays, fill, dtype):
+        out = np.full((len(trees), n_nodes), fill, dtype=dtype)
+        for i, array in enumerate(arrays):
+            out[i, :len(array)] = array
+        return out
+    
+    return {
+        "left": stack([tree.children_left for tree in trees], -1, np.intp),
+        "right": stack([tree.children_right for tree in trees], -1, np.intp),
+        "feature": stack([np.maximum(tree.feature, 0) for tree in trees], 0, np.intp),
+        "threshold": stack([tree.threshold for tree in trees], 0.0, np.float64),
+        "value": stack([tree.value[:, 0, 0] for tree in trees], 0.0, np.float64),
+        "depth": max(tree.max_depth for tree in trees)
+    }
+
+def predict_forest(forest, X):
+    """Walk every tree of a compiled forest at once, one tree level per step"""
+    tree_idx = np.arange(forest["left"].shape[0])[:, None]
+    sample_idx = np.arange(X.shape[0])[None, :]
+    node = np.zeros((forest["left"].shape[0], X.shape[0]), dtype=np.intp)
+    
+    for _ in range(forest["depth"]):
+        left = forest["left"][tree_idx, node]
+        go_left = X[sample_idx, forest["feature"][tree_idx, node]] <= forest["threshold"][tree_idx, node]
+        child = np.where(go_left, left, forest["right"][tree_idx, node])
+        # Leaves (left == -1) stay put
+        node = np.where(left == -1, node, child)
+    
+    return forest["value"][tree_idx, node].mean(axis=0)
+
+def make_predict_fn(model):
+    """Specialize a one-row predict function for a loaded model at startup"""
+    predict = model.predict
+    
+    if not isinstance(model, RandomForestRegressor):
+        return lambda features: float(predict(features)[0])
+    
+    # Random forests are served through the vectorized traversal above instead
+    # of sklearn's per-estimator predict loop
+    forest = compile_forest(model)
+    
+    def predict_fn(features):
+        X = features.to_numpy()
+        if np.isnan(X).any():
+            # NaN routing depends on sklearn's missing-value rules, so defer to it
+            return float(predict(features)[0])
+        return float(predict_forest(forest, X)[0])
+    
+    return predict_fn
+
+PREDICT_FN = {horizon: make_predict_fn(model) for horizon, model in models.items()}
+
+# Dedicated pool for CPU-bound model inference, kept separate from the
+# threadpool that serves blocking Feast/SQLite I/O
+PREDICT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Online features only change once per materialization, so identical feature
+# vectors keep producing identical predictions; cache them for a few minutes
+PRED_CACHE = TTLCache(maxsize=1024, ttl=300)
+_pred_cache_lock = threading.Lock()
+
+def feature_digest(features):
+    """Hash a prepared feature matrix for prediction cache lookups"""
+    return hashlib.blake2b(features.to_numpy().tobytes(), digest_size=16).digest()
+
+def predict_horizon(horizon, features, digest=None):
+    """Predict AQI for one horizon, reusing cached results for identical features"""
+    key = (horizon, digest if digest is not None else feature_digest(features))
+    
+    with _pred_cache_lock:
+        cached_prediction = PRED_CACHE.get(key)
+    if cached_prediction is not None:
+        return cached_prediction
+    
+    prediction = PREDICT_FN[horizon](features)
+    
+    with _pred_cache_lock:
+        PRED_CACHE[key] = prediction
+    return prediction
+
+def predict_all_horizons(features):
+    """Predict 24h/48h/72h from one shared feature matrix and cache digest"""
+    digest = feature_digest(features)
+    return {horizon: predict_horizon(horizon, features, digest) for horizon in ("24h", "48h", "72h")}
+
+async def predict_in_pool(func, *args):
+    """Run a blocking prediction function on the inference pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PREDICT_POOL, func, *args)
+
+def fill_nans(raw):
+    """Forward-fill, backward-fill, then median-fill NaNs column-wise in one numpy pass"""
+    missing = np.isnan(raw)
+    if not missing.any():
+        return raw
+    
+    n_rows = raw.shape[0]
+    cols = np.arange(raw.shape[1])
+    
+    # Forward fill: index of the last valid row seen so far in each column
+    idx = np.where(missing, 0, np.arange(n_rows)[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    raw = raw[idx, cols]
+    
+    # Backward fill: same trick on the reversed rows
+    missing = np.isnan(raw)
+    idx = np.where(missing, n_rows - 1, np.arange(n_rows)[:, None])
+    idx = np.minimum.accumulate(idx[::-1], axis=0)[::-1]
+    raw = raw[idx, cols]
+    
+    missing = np.isnan(raw)
+    if missing.any():
+        with warnings.catch_warnings():
+            # All-NaN columns stay NaN, same as the previous pandas median fill
+            warnings.simplefilter("ignore", RuntimeWarning)
+            medians = np.nanmedian(raw, axis=0)
+        raw = np.where(missing, medians, raw)
+    
+    return raw
+
+def prepare_features(features):
+    """Build the float32 training-feature matrix from an online-store dict, NaNs filled"""
+    n_rows = len(features.get("location_id", [None]))
+    # None (missing value) becomes NaN under a float dtype; absent features are all-NaN
+    raw = np.array(
+        [features.get(col, [None] * n_rows) for col in TRAINING_FEATURES],
+        dtype=np.float64
+    ).T
+    raw = fill_nans(raw)
+    
+    # Both tree libraries predict in float32, so convert once and share across horizons
+    return pd.DataFrame(raw.astype(np.float32), columns=TRAINING_FEATURES)
+
+# The online store only changes when features are materialized, so repeated
+# lookups within a short window can reuse the previous response
+ONLINE_CACHE = TTLCache(maxsize=16, ttl=30)
+_online_cache_lock = threading.Lock()
+
+@cached(ONLINE_CACHE, lock=_online_cache_lock)
+def fetch_online_features(features, location_id=LOCATION_ID):
+    """Fetch online features for one location as a dict of lists (blocking, cached)"""
+    response = store.get_online_features(
+        features=list(features),
+        entity_rows=[{"location_id": location_id}]
+    ).to_dict()
+    
+    # Unbox numpy scalars once here rather than on every serialization
+    return {
+        name: [value.item() if hasattr(value, 'item') else value for value in values]
+        for name, values in response.items()
+    }
+
+def fetch_current_aqi():
+    """Fetch current AQI readings from online store (blocking)"""
+    return fetch_online_features(CURRENT_AQI_FEATURES)
+
 @app.get("/current-aqi")
-def get_current_aqi():
+async def get_current_aqi():
     """Get current AQI from online store"""
-    features = store.get_online_features(
-        features=[
-            "aqi_features:aqi",
-            "aqi_features:pm25",
-            "aqi_features:dominant_pollutant",
-            "aqi_features:temp",
-            "aqi_features:humidity",
-            "aqi_features:pressure",
-            "aqi_features:wind_speed",
-            "aqi_features:dew"
-        ],
-        entity_rows=[{"location_id": "islamabad_us_embassy"}]
-    ).to_dict()
-    return features
+    return await run_in_threadpool(fetch_current_aqi)
 
 @app.get("/predict/{horizon}")
-def predict_aqi(horizon: str):
+async def predict_aqi(horizon: str):
     """Predict AQI for specific horizon (24h, 48h, 72h)"""
-    # 1. Get latest features from online store
-    features_df = store.get_online_features(
-        features=[
-            "aqi_features:temp",
-            "aqi_features:humidity",
-            "aqi_features:pressure",
-            "aqi_features:wind_speed",
-            "aqi_features:dew",
-            "aqi_features:pm25",
-            "aqi_features:hour",
-            "aqi_features:day",
-            "aqi_features:month",
-            "aqi_features:year",
-            "aqi_features:day_of_week",
-            "aqi_features:aqi_change",
-            "aqi_features:aqi_roll3"
-        ],
-        entity_rows=[{"location_id": "islamabad_us_embassy"}]
-    ).to_df()
-    
-    # 2. Prepare features for prediction (match training pipeline)
-    # Define the exact feature columns used during training
-    training_features = [
-        'hour', 'day_of_week', 'month', 'year',
-        'temp', 'humidity', 'pressure', 'wind_speed', 'dew', 'pm25'
-    ]
-    
-    # Drop entity columns and select only training features
-    features = features_df[training_features].copy()
-    
-    # Convert all columns to numeric (handle any object dtypes)
-    for col in features.columns:
-        features[col] = pd.to_numeric(features[col], errors='coerce')
-    
-    # Handle any NaN values (forward fill, then backward fill, then median)
-    features = features.ffill().bfill()
-    for col in features.columns:
-        if features[col].isna().any():
-            features[col] = features[col].fillna(features[col].median())
-    
-    # 3. Predict using appropriate model
-    model = models[horizon]
-    prediction = model.predict(features)
-    
-    return {"horizon": horizon, "predicted_aqi": float(prediction[0])}
+    # 1-2. Get latest features from online store, prepared to match training
+    features = await run_in_threadpool(get_latest_features_from_online_store)
+    
+    # 3. Predict using appropriate model (cached per feature vector)
+    prediction = await predict_in_pool(predict_horizon, horizon, features)
+    
+    return {"horizon": horizon, "predicted_aqi": prediction}
 
 def get_latest_features_from_online_store():
     """Helper function to get latest features from online store"""
-    features_df = store.get_online_features(
-        features=[
-            "aqi_features:temp",
-            "aqi_features:humidity",
-            "aqi_features:pressure",
-            "aqi_features:wind_speed",
-            "aqi_features:dew",
-            "aqi_features:pm25",
-            "aqi_features:hour",
-            "aqi_features:day",
-            "aqi_features:month",
-            "aqi_features:year",
-            "aqi_features:day_of_week",
-            "aqi_features:aqi_change",
-            "aqi_features:aqi_roll3"
-        ],
-        entity_rows=[{"location_id": "islamabad_us_embassy"}]
-    ).to_df()
-    
-    # Prepare features for prediction (match training pipeline)
-    training_features = [
-        'hour', 'day_of_week', 'month', 'year',
-        'temp', 'humidity', 'pressure', 'wind_speed', 'dew', 'pm25'
-    ]
-    
-    # Drop entity columns and select only training features
-    # Remove any entity columns that might be causing issues
-    available_features = [col for col in training_features if col in features_df.columns]
-    features = features_df[available_features].copy()
-    
-    # Convert all columns to numeric (handle any object dtypes)
-    for col in features.columns:
-        features[col] = pd.to_numeric(features[col], errors='coerce')
-    
-    # Handle any NaN values (forward fill, then backward fill, then median)
-    features = features.ffill().bfill()
-    for col in features.columns:
-        if features[col].isna().any():
-            features[col] = features[col].fillna(features[col].median())
-    
-    return features
+    # Prepare features for prediction (match training pipeline) without an
+    # intermediate DataFrame for the single-row response
+    return prepare_features(fetch_online_features(PREDICT_FEATURES))
 
 @app.get("/predictions/all")
-def get_all_predictions():
+async def get_all_predictions():
     """Get all predictions (24h, 48h, 72h) at once"""
-    features = get_latest_features_from_online_store()
+    # Both online store lookups are independent, so overlap them
+    current_aqi, features = await asyncio.gather(
+        run_in_threadpool(fetch_current_aqi),
+        run_in_threadpool(get_latest_features_from_online_store)
+    )
     
     return {
-        "current_aqi": get_current_aqi(),
-        "predictions": {
-            "24h": float(models["24h"].predict(features)[0]),
-            "48h": float(models["48h"].predict(features)[0]),
-            "72h": float(models["72h"].predict(features)[0])
-        }
+        "current_aqi": current_aqi,
+        "predictions": await predict_in_pool(predict_all_horizons, features)
     }
 
+# Shared secret for /cache/invalidate; the endpoint is disabled when unset
+CACHE_INVALIDATE_TOKEN = os.getenv("CACHE_INVALIDATE_TOKEN")
+
+@app.post("/cache/invalidate")
+def invalidate_cache(x_cache_token: str = Header(None)):
+    """Drop cached online features, e.g. right after a materialization run
+    
+    Meant for whoever runs the materialization (an operator or a deploy hook),
+    sending CACHE_INVALIDATE_TOKEN in the X-Cache-Token header. The workflows
+    do not call it; without a call, cached features expire after ONLINE_CACHE's TTL.
+    """
+    if not CACHE_INVALIDATE_TOKEN or not hmac.compare_digest(x_cache_token or "", CACHE_INVALIDATE_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid cache token")
+    
+    # The store handle is shared process-wide, so reload its registry in place
+    store.refresh_registry()
+    # Clear under the same lock the cached lookup uses to read and fill entries
+    with _online_cache_lock:
+        ONLINE_CACHE.clear()
+    return {"status": "ok"}
+
 # ============ NEW PERFORMANCE TRACKING ENDPOINTS ============
 
+# Columns (and JSON types) returned for each performance history row
+HISTORY_DTYPES = {
+    'timestamp': 'object',
+    'model': 'object',
+    'rmse': 'float64',
+    'mae': 'float64',
+    'r2': 'float64',
+    'mape': 'float64',
+    'n_test_samples': 'int64',
+    'deployed': 'bool'
+}
+
+def performance_records(history_df):
+    """Convert performance rows to JSON-ready dicts in one columnwise pass"""
+    if 'deployed' not in history_df.columns:
+        history_df = history_df.assign(deployed=0)
+    history_df = history_df.fillna({'deployed': 0})
+    
+    return history_df[list(HISTORY_DTYPES)].astype(HISTORY_DTYPES).to_dict(orient='records')
+
+DEPLOYMENT_METADATA_PATH = "models/deployment_metadata.json"
+
+# Parsed deployment metadata as (mtime, dict), reused until the file changes
+_deployment_metadata_cache = (None, None)
+
+def load_deployment_metadata():
+    """Load deployment metadata cached by file mtime (None if the file is missing)"""
+    global _deployment_metadata_cache
+    
+    try:
+        mtime = os.path.getmtime(DEPLOYMENT_METADATA_PATH)
+    except OSError:
+        return None
+    
+    cached_mtime, cached_metadata = _deployment_metadata_cache
+    if mtime == cached_mtime:
+        return cached_metadata
+    
+    with open(DEPLOYMENT_METADATA_PATH, 'rb') as f:
+        metadata = orjson.loads(f.read())
+    _deployment_metadata_cache = (mtime, metadata)
+    return metadata
+
 @app.get("/model/info/{horizon}")
 def get_model_info(horizon: str):
     """Get information about active model for a specific horizon"""
     try:
-        deployment_metadata_path = "models/deployment_metadata.json"
+        metadata = load_deployment_metadata()
         
-        if not os.path.exists(deployment_metadata_path):
+        if metadata is None:
             return {"error": "Deployment metadata not found"}
         
-        with open(deployment_metadata_path, 'r') as f:
-            metadata = json.load(f)
-        
         if horizon not in metadata.get('deployment_info', {}):
             return {"error": f"No model found for horizon {horizon}"}
         
@@ -224,31 +421,29 @@ def get_model_info(horizon: str):
 def get_performance_overview():
     """Get dashboard overview for all models"""
     try:
-        from performance_db import get_best_model_for_horizon, get_performance_history
-        
-        deployment_metadata_path = "models/deployment_metadata.json"
+        from performance_db import get_overview_bundle
         
         # Load deployment metadata
-        deployment_info = {}
-        if os.path.exists(deployment_metadata_path):
-            with open(deployment_metadata_path, 'r') as f:
-                metadata = json.load(f)
-                deployment_info = metadata.get('deployment_info', {})
+        metadata = load_deployment_metadata() or {}
+        deployment_info = metadata.get('deployment_info', {})
+        
+        # One query returns best run, last two runs and run count per horizon
+        bundle_df = get_overview_bundle()
+        bundles = dict(tuple(bundle_df.groupby('horizon')))
         
         results = {}
         
         for horizon in ['24h', '48h', '72h']:
-            # Get best model from SQLite
-            best_model_df = get_best_model_for_horizon(horizon)
+            horizon_df = bundles.get(horizon)
             
-            if len(best_model_df) == 0:
+            if horizon_df is None:
                 results[horizon] = {"error": "No data available"}
                 continue
             
-            best_model = best_model_df.iloc[0]
+            best_model = horizon_df[horizon_df['rn_best'] == 1].iloc[0]
             
             # Calculate trend (compare last 2 runs if available)
-            history_df = get_performance_history(horizon, limit=2)
+            history_df = horizon_df[horizon_df['rn_recent'] <= 2]
             trend = "stable"
             
             if len(history_df) >= 2:
@@ -262,10 +457,7 @@ def get_performance_overview():
             # Get deployment info
             dep_info = deployment_info.get(horizon, {})
             
-            # Get total runs
-            from performance_db import get_all_performance
-            all_data = get_all_performance()
-            total_runs = len(all_data[all_data['horizon'] == horizon])
+            total_runs = int(best_model['total_runs'])
             
             results[horizon] = {
                 "current_rmse": float(best_model['rmse']),
@@ -301,18 +493,7 @@ def get_performance_history_for_horizon(horizon: str, limit: int = 50):
             return {"error": f"No performance data found for horizon {horizon}"}
         
         # Convert to list of dicts for JSON response
-        results = []
-        for _, row in history_df.iterrows():
-            results.append({
-                "timestamp": row['timestamp'],
-                "model": row['model'],
-                "rmse": float(row['rmse']),
-                "mae": float(row['mae']),
-                "r2": float(row['r2']),
-                "mape": float(row['mape']),
-                "n_test_samples": int(row['n_test_samples']),
-                "deployed": bool(row.get('deployed', 0))
-            })
+        results = performance_records(history_df)
         
         return {
             "horizon": horizon,
@@ -334,43 +515,47 @@ def get_full_performance_history():
         if len(df) == 0:
             return {"error": "No performance data found"}
         
-        # Group by horizon
+        # Convert once, then group records by horizon (newest first)
+        df = df.sort_values('timestamp', ascending=False)
         results = {}
-        for horizon in df['horizon'].unique():
-            horizon_data = df[df['horizon'] == horizon].sort_values('timestamp', ascending=False)
-            
-            results[horizon] = []
-            for _, row in horizon_data.iterrows():
-                results[horizon].append({
-                    "timestamp": row['timestamp'],
-                    "model": row['model'],
-                    "rmse": float(row['rmse']),
-                    "mae": float(row['mae']),
-                    "r2": float(row['r2']),
-                    "mape": float(row['mape']),
-                    "n_test_samples": int(row['n_test_samples']),
-                    "deployed": bool(row.get('deployed', 0))
-                })
+        for horizon, record in zip(df['horizon'], performance_records(df)):
+            results.setdefault(horizon, []).append(record)
         
         return results
     
     except Exception as e:
         return {"error": str(e)}
 
+# Parsed performance history CSV as (mtime, DataFrame), reused until the file changes
+_history_csv_cache = (None, None)
+
+def load_performance_history_csv(history_file):
+    """Load performance history indexed by horizon (newest first), cached by file mtime"""
+    global _history_csv_cache
+    
+    mtime = os.path.getmtime(history_file)
+    cached_mtime, cached_df = _history_csv_cache
+    if mtime == cached_mtime:
+        return cached_df
+    
+    df = pd.read_csv(history_file)
+    df = df.sort_values(['horizon', 'timestamp'], ascending=[True, False]).set_index('horizon')
+    _history_csv_cache = (mtime, df)
+    return df
+
 @app.get("/model/comparison/{horizon}")
 def get_model_comparison(horizon: str):
     """Compare current vs previous model performance"""
     try:
         history_file = "model_performance_history.csv"
-        deployment_metadata_path = "models/deployment_metadata.json"
         
         if not os.path.exists(history_file):
             return {"error": "Performance history not found"}
         
-        df = pd.read_csv(history_file)
+        df = load_performance_history_csv(history_file)
         
-        # Filter by horizon and sort by timestamp
-        horizon_data = df[df['horizon'] == horizon].sort_values('timestamp', ascending=False)
+        # Rows are pre-sorted newest first within each horizon
+        horizon_data = df.loc[[horizon]] if horizon in df.index else df.iloc[:0]
         
         if len(horizon_data) < 2:
             return {"error": "Insufficient data for comparison (need at least 2 training runs)"}
@@ -386,11 +571,9 @@ def get_model_comparison(horizon: str):
         
         # Load deployment info
         active_version = "unknown"
-        if os.path.exists(deployment_metadata_path):
-            with open(deployment_metadata_path, 'r') as f:
-                metadata = json.load(f)
-                if horizon in metadata.get('deployment_info', {}):
-                    active_version = metadata['deployment_info'][horizon].get('version', 'unknown')
+        metadata = load_deployment_metadata() or {}
+        if horizon in metadata.get('deployment_info', {}):
+            active_version = metadata['deployment_info'][horizon].get('version', 'unknown')
         
         return {
             "horizon": horizon,
@@ -14,6 +14,8 @@ load_dotenv()
 AQICN_TOKEN = os.getenv("AQICN_TOKEN")
 CITY = "islamabad"
 AQICN_URL = f"http://api.waqi.info/feed/{CITY}/?token={AQICN_TOKEN}"
+# Feeds fetched on each pipeline run; add a station's URL here to monitor it too
+AQICN_URLS = [AQICN_URL]
 
 # Feast Feature Store Configuration
 FEAST_REPO_PATH = "feature_repo"
@@ -17,16 +17,24 @@ if [ $? -eq 0 ]; then
     
     # Optional: Run training pipeline if you have enough data
     echo "🤖 Checking if we should run training..."
+    # Row count and latest timestamp come from the parquet footer; no column data is decoded
     python -c "
 import pandas as pd
-df = pd.read_parquet('feature_repo/data/aqi_features.parquet')
-hours = (pd.Timestamp.now() - pd.to_datetime(df['timestamp'].max())).total_seconds() / 3600
-if len(df) >= 72 and hours < 2:
+import pyarrow.parquet as pq
+from feast_utils import FEAST_DATA_FILE, get_stored_timestamp_range
+records = pq.ParquetFile(FEAST_DATA_FILE).metadata.num_rows
+timestamp_range = get_stored_timestamp_range()
+if timestamp_range is None:
+    latest = pd.read_parquet(FEAST_DATA_FILE, columns=['timestamp'])['timestamp'].max()
+else:
+    latest = timestamp_range[1]
+hours = (pd.Timestamp.now(tz='UTC') - pd.to_datetime(latest, utc=True)).total_seconds() / 3600
+if records >= 72 and hours < 2:
     print('✅ Data is fresh and sufficient - running training pipeline')
     import subprocess
     subprocess.run(['python', 'training_pipeline.py'])
 else:
-    print(f'⏳ Not enough data yet: {len(df)} records, {hours:.1f} hours old')
+    print(f'⏳ Not enough data yet: {records} records, {hours:.1f} hours old')
 "
 else
     echo "❌ Daily sync failed"
@@ -4,16 +4,90 @@ Helper functions for AQI feature pipeline
 """
 from feast import FeatureStore
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from datetime import datetime
+import functools
 import os
 
 FEAST_REPO_PATH = "feature_repo"
 FEAST_DATA_FILE = "feature_repo/data/aqi_features.parquet"
+LOCATION_ID = "islamabad_us_embassy"
 
+# About a month of hourly rows per row group: rows are sorted by timestamp, so
+# each group's min/max statistics let date-filtered reads skip whole months
+OFFLINE_ROW_GROUP_SIZE = 24 * 30
+
+# zstd with dictionary pages: smaller than the default snappy, which shrinks the
+# Actions artifact the sync script downloads, at similar read speed
+OFFLINE_WRITE_OPTIONS = dict(
+    compression='zstd',
+    compression_level=3,
+    use_dictionary=True,
+    data_page_size=1 << 20
+)
+
+# Reused on every online lookup instead of being rebuilt per call
+LATEST_FEATURES = [
+    "aqi_features:aqi",
+    "aqi_features:pm25",
+    "aqi_features:temp",
+    "aqi_features:humidity",
+    "aqi_features:pressure",
+    "aqi_features:wind_speed",
+]
+LOCATION_ENTITY_ROWS = [{"location_id": LOCATION_ID}]
+
+@functools.lru_cache(maxsize=1)
 def get_feast_store():
-    """Initialize and return Feast FeatureStore"""
+    """Initialize and return the process-wide Feast FeatureStore"""
     return FeatureStore(repo_path=FEAST_REPO_PATH)
 
+def get_stored_timestamp_range():
+    """Return (min, max) timestamp of the offline store from parquet footer statistics
+    
+    Returns None if the file has no usable statistics.
+    """
+    metadata = pq.ParquetFile(FEAST_DATA_FILE).metadata
+    ts_index = metadata.schema.to_arrow_schema().get_field_index('timestamp')
+    
+    mins, maxs = [], []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(ts_index).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        mins.append(pd.Timestamp(stats.min))
+        maxs.append(pd.Timestamp(stats.max))
+    
+    if not maxs:
+        return None
+    
+    # Footer values may come back naive; stored timestamps are always UTC
+    low, high = min(mins), max(maxs)
+    if low.tzinfo is None:
+        low, high = low.tz_localize('UTC'), high.tz_localize('UTC')
+    return low, high
+
+def get_recent_values(column, n):
+    """Return the last n stored values of a column (oldest first)
+    
+    Rows are kept sorted by timestamp, so the final row group usually holds them.
+    """
+    if not os.path.exists(FEAST_DATA_FILE):
+        return []
+    
+    parquet_file = pq.ParquetFile(FEAST_DATA_FILE)
+    num_row_groups = parquet_file.metadata.num_row_groups
+    if num_row_groups == 0:
+        return []
+    
+    tail = parquet_file.read_row_group(num_row_groups - 1, columns=[column]).column(column)
+    if len(tail) < n:
+        tail = parquet_file.read(columns=[column]).column(column)
+    
+    return tail.slice(max(len(tail) - n, 0)).to_pylist()
+
 def append_features_to_offline_store(df):
     """
     Append new features to the Parquet file (offline store)
@@ -25,7 +99,7 @@ def append_features_to_offline_store(df):
     
     # Ensure location_id exists
     if 'location_id' not in df.columns:
-        df['location_id'] = 'islamabad_us_embassy'
+        df['location_id'] = LOCATION_ID
     
     # Ensure timestamp is timezone-aware (UTC)
     if df['timestamp'].dt.tz is None:
@@ -33,21 +107,47 @@ def append_features_to_offline_store(df):
     else:
         df['timestamp'] = df['timestamp'].dt.tz_convert('UTC')
     
-    # Convert feature_timestamp to string format for Parquet compatibility
-    if 'feature_timestamp' in df.columns:
-        df['feature_timestamp'] = df['feature_timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S UTC')
+    # Convert feature_timestamp to string format (the Feast schema declares it as String).
+    # Arrow formats the whole column in C++ instead of one Python strftime call per row;
+    # casting to whole seconds first keeps %S free of a fractional part.
+    if 'feature_timestamp' in df.columns and pd.api.types.is_datetime64_any_dtype(df['feature_timestamp']):
+        seconds = pa.array(df['feature_timestamp']).cast(pa.timestamp('s', tz='UTC'), safe=False)
+        df['feature_timestamp'] = pc.strftime(seconds, format='%Y-%m-%d %H:%M:%S UTC').to_numpy(zero_copy_only=False)
     
     # Append to existing parquet file
     if os.path.exists(FEAST_DATA_FILE):
+        # Hourly data arrives in order, so a batch strictly newer than the footer's
+        # max timestamp cannot collide and needs no scan of the stored column
+        stored_range = get_stored_timestamp_range()
+        if stored_range is None or not (df['timestamp'] > stored_range[1]).all():
+            # Probe only the timestamp column so duplicate-only batches skip the full rewrite
+            existing_ts = pd.read_parquet(FEAST_DATA_FILE, columns=['timestamp'])['timestamp']
+            df = df[~df['timestamp'].isin(existing_ts)]
+        df = df.drop_duplicates(subset=['timestamp'], keep='last')
+        
+        if df.empty:
+            print("ℹ️  No new timestamps, offline store unchanged")
+            print(f"   Total records in offline store: {pq.ParquetFile(FEAST_DATA_FILE).metadata.num_rows}")
+            return True
+        
         existing_df = pd.read_parquet(FEAST_DATA_FILE)
         combined_df = pd.concat([existing_df, df], ignore_index=True)
-        combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
-        combined_df = combined_df.sort_values('timestamp')
     else:
         combined_df = df
     
-    # Save back to parquet
-    combined_df.to_parquet(FEAST_DATA_FILE, index=False)
+    # New hours normally land after the stored ones, so only sort on backfills
+    if not combined_df['timestamp'].is_monotonic_increasing:
+        combined_df = combined_df.sort_values('timestamp', ignore_index=True)
+    
+    # Save back to parquet, recording the timestamp order in the footer so
+    # mergers can rely on it
+    combined_df.to_parquet(
+        FEAST_DATA_FILE,
+        index=False,
+        row_group_size=OFFLINE_ROW_GROUP_SIZE,
+        sorting_columns=[pq.SortingColumn(combined_df.columns.get_loc('timestamp'))],
+        **OFFLINE_WRITE_OPTIONS
+    )
     
     print(f"✅ Saved {len(df)} new records")
     print(f"   Total records in offline store: {len(combined_df)}")
@@ -64,6 +164,8 @@ def materialize_to_online_store(end_date=None):
     print("🔄 Materializing features to online store...")
     
     store = get_feast_store()
+    # Pick up any `feast apply` changes without rebuilding the cached store
+    store.refresh_registry()
     
     if end_date is None:
         end_date = datetime.now()
@@ -77,13 +179,14 @@ def materialize_to_online_store(end_date=None):
         print(f"⚠️  Materialization error: {e}")
         return False
 
-def get_historical_features_for_training(start_date, end_date):
+def get_historical_features_for_training(start_date, end_date, columns=None):
     """
     Load historical features for model training
     
     Args:
         start_date: datetime - start of training period
         end_date: datetime - end of training period
+        columns: list or None - columns to load (all columns if None)
         
     Returns:
         pandas DataFrame with features
@@ -91,17 +194,24 @@ def get_historical_features_for_training(start_date, end_date):
     print(f"📊 Loading historical features from Feast...")
     print(f"   Date range: {start_date} to {end_date}")
     
-    # Read directly from parquet for training (faster than Feast API)
-    df = pd.read_parquet(FEAST_DATA_FILE)
-    
     # Ensure date parameters are timezone-aware (UTC)
     if start_date.tzinfo is None:
         start_date = pd.Timestamp(start_date).tz_localize('UTC')
     if end_date.tzinfo is None:
         end_date = pd.Timestamp(end_date).tz_localize('UTC')
     
-    # Filter by date range
-    df = df[(df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)]
+    # Only project columns that exist; callers report missing ones themselves
+    if columns is not None:
+        available = set(pq.read_schema(FEAST_DATA_FILE).names)
+        columns = [col for col in columns if col in available]
+    
+    # Read directly from parquet for training (faster than Feast API);
+    # the date filter is pushed down so row groups outside the range are skipped
+    df = pd.read_parquet(
+        FEAST_DATA_FILE,
+        columns=columns,
+        filters=[('timestamp', '>=', start_date), ('timestamp', '<=', end_date)]
+    )
     
     print(f"✅ Loaded {len(df)} records")
     
@@ -111,18 +221,9 @@ def get_latest_features():
     """Get the most recent features from online store"""
     store = get_feast_store()
     
-    entity_rows = [{"location_id": "islamabad_us_embassy"}]
-    
     features = store.get_online_features(
-        features=[
-            "aqi_features:aqi",
-            "aqi_features:pm25",
-            "aqi_features:temp",
-            "aqi_features:humidity",
-            "aqi_features:pressure",
-            "aqi_features:wind_speed",
-        ],
-        entity_rows=entity_rows
+        features=LATEST_FEATURES,
+        entity_rows=LOCATION_ENTITY_ROWS
     ).to_dict()
     
     return features
\ No newline at end of file
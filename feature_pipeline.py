@@ -3,27 +3,48 @@ AQI Feature Pipeline - Hourly Data Ingestion
 Fetches data from AQICN API and stores in BigQuery (syncs to Feature Store)
 """
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import os
-from feast_utils import append_features_to_offline_store, materialize_to_online_store
+from feast_utils import append_features_to_offline_store, get_recent_values
 from config import (
     AQICN_TOKEN,
     CITY,
     AQICN_URL,
+    AQICN_URLS,
     validate_config
 )
 
-def fetch_data():
+# Connections kept per host; also the most feeds fetched at once
+_POOL_MAXSIZE = 4
+
+# Shared session so repeated calls in one process reuse the keep-alive
+# connection, with retries on transient API failures
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=_POOL_MAXSIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+def fetch_data(url=AQICN_URL):
     """Fetch AQI data from AQICN API"""
     print("🌍 Fetching AQI data from API...")
     
     try:
-        response = requests.get(AQICN_URL, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         print(f"📡 API Response: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            # orjson decodes the raw bytes directly, skipping the text re-decode
+            data = orjson.loads(response.content)
             print("✅ API call successful")
             return data
         else:
@@ -38,38 +59,80 @@ def fetch_data():
         print(f"❌ Unexpected Error: {e}")
         return None
 
-def parse_features(data):
-    """Parse API response and extract features"""
-    print("🔧 Parsing features from API response...")
+def fetch_all(urls):
+    """Fetch several AQICN feeds concurrently over the shared session"""
+    # Requests are I/O bound, so threads overlap the waits; more threads than
+    # pooled connections would only queue on the adapter
+    with ThreadPoolExecutor(max_workers=max(1, min(len(urls), _POOL_MAXSIZE))) as executor:
+        return list(executor.map(fetch_data, urls))
+
+# Parsed column order, kept stable for the offline store
+SCHEMA = (
+    "timestamp", "city", "aqi", "dominant_pollutant", "pm25",
+    "latitude", "longitude",
+    "dew", "humidity", "pressure", "temp", "wind_speed"
+)
+
+# (output column, AQICN iaqi key) pairs for the per-pollutant/weather readings
+_IAQI_FIELDS = (
+    ("pm25", "pm25"),
+    ("dew", "dew"),
+    ("humidity", "h"),
+    ("pressure", "p"),
+    ("temp", "t"),
+    ("wind_speed", "w"),
+)
+_EMPTY = {}  # shared default for missing readings, never mutated
+
+# Narrow dtypes matching feature_repo/features.py (Int32/Float32); aqi is
+# nullable because AQICN reports "-" when a station has no reading
+_NUMERIC_DTYPES = {
+    "aqi": "Int32",
+    "pm25": "float32",
+    "latitude": "float32",
+    "longitude": "float32",
+    "dew": "float32",
+    "humidity": "float32",
+    "pressure": "float32",
+    "temp": "float32",
+    "wind_speed": "float32",
+}
+
+def parse_features_batch(data_list):
+    """Parse several API responses into one DataFrame, one list per column"""
+    columns = {name: [] for name in SCHEMA}
     
-    try:
-        features = {}
+    for data in data_list:
+        payload = data["data"]
+        city = payload["city"]
         
         # Core AQI data
-        features["timestamp"] = data["data"]["time"]["s"]
-        features["city"] = data["data"]["city"]["name"]
-        features["aqi"] = data["data"]["aqi"]
-        features["dominant_pollutant"] = data["data"]["dominentpol"]
-        
-        # Air quality measurements
-        iaqi = data["data"]["iaqi"]
-        features["pm25"] = iaqi.get("pm25", {}).get("v")
+        columns["timestamp"].append(payload["time"]["s"])
+        columns["city"].append(city["name"])
+        columns["aqi"].append(payload["aqi"])
+        columns["dominant_pollutant"].append(payload["dominentpol"])
         
         # Location data
-        geo = data["data"]["city"]["geo"]
-        features["latitude"] = geo[0]
-        features["longitude"] = geo[1]
-        
-        # Weather data
-        features["dew"] = iaqi.get("dew", {}).get("v")
-        features["humidity"] = iaqi.get("h", {}).get("v")
-        features["pressure"] = iaqi.get("p", {}).get("v")
-        features["temp"] = iaqi.get("t", {}).get("v")
-        features["wind_speed"] = iaqi.get("w", {}).get("v")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([features])
-        print(f"✅ Parsed {len(features)} features successfully")
+        geo = city["geo"]
+        columns["latitude"].append(geo[0])
+        columns["longitude"].append(geo[1])
+        
+        # Air quality and weather measurements
+        iaqi = payload["iaqi"]
+        for name, key in _IAQI_FIELDS:
+            columns[name].append(iaqi.get(key, _EMPTY).get("v"))
+    
+    # Build the DataFrame once from whole columns, then narrow dtypes in one pass
+    columns["aqi"] = pd.to_numeric(pd.Series(columns["aqi"], dtype=object), errors="coerce")
+    return pd.DataFrame(columns, copy=False).astype(_NUMERIC_DTYPES)
+
+def parse_features(data):
+    """Parse API response and extract features"""
+    print("🔧 Parsing features from API response...")
+    
+    try:
+        df = parse_features_batch([data])
+        print(f"✅ Parsed {len(df.columns)} features successfully")
         return df
         
     except KeyError as e:
@@ -85,25 +148,50 @@ def engineer_features(df):
     
     try:
         # Convert timestamp to datetime
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        # AQICN's time.s field is always "%Y-%m-%d %H:%M:%S", so skip format inference
+        timestamp = pd.to_datetime(df["timestamp"], format="%Y-%m-%d %H:%M:%S", cache=True)
         
-        # Time-based features
-        df["hour"] = df["timestamp"].dt.hour
-        df["day"] = df["timestamp"].dt.day
-        df["month"] = df["timestamp"].dt.month
-        df["year"] = df["timestamp"].dt.year
-        df["day_of_week"] = df["timestamp"].dt.dayofweek  # 0=Monday, 6=Sunday
+        # Time-based features, derived from one datetime64 array by truncating
+        # to day/month/year units instead of five separate .dt accessor passes
+        ts = timestamp.to_numpy(dtype="datetime64[ns]")
+        days = ts.astype("datetime64[D]")
+        months = ts.astype("datetime64[M]")
+        seconds = (ts - days) // np.timedelta64(1, "s")
         
-        # Create entity_id for Feature Store (ISO 8601 format)
-        df["entity_id"] = df["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S")
+        # Stored as int32 to match the Int32 fields in the Feast schema
+        hour = (seconds // 3600).astype(np.int32)
+        day = ((days - months.astype("datetime64[D]")).astype(np.int64) + 1).astype(np.int32)
+        month = (months.astype(np.int64) % 12 + 1).astype(np.int32)
+        year = (ts.astype("datetime64[Y]").astype(np.int64) + 1970).astype(np.int32)
         
-        # Feature timestamp for Feature Store (same as timestamp)
-        df["feature_timestamp"] = df["timestamp"]
+        # Create entity_id for Feature Store (ISO 8601 format), assembled from the
+        # integer parts above rather than through the slow strftime path
+        entity_id = [
+            f"{y:04d}-{m:02d}-{d:02d}T{h:02d}:{mi:02d}:{sec:02d}"
+            for y, m, d, h, mi, sec in zip(year, month, day, hour, seconds % 3600 // 60, seconds % 60)
+        ]
         
-        # Derived features (for now, set to None since we only have 1 row)
-        # These will be calculated when we have historical data
-        df["aqi_change"] = None  # Will be calculated in future runs
-        df["aqi_roll3"] = None   # Will be calculated in future runs
+        # Derived features: only the newest rows change, so extend the last two
+        # stored AQI readings instead of recomputing diff/rolling over history
+        previous = pd.to_numeric(pd.Series(get_recent_values("aqi", 2), dtype=object), errors="coerce")
+        history = np.full(2, np.nan)
+        history[2 - len(previous):] = previous.to_numpy(dtype=np.float64)
+        current = pd.to_numeric(df["aqi"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        aqi = np.concatenate([history, current])
+        
+        # Add every new column in one block-manager update
+        df = df.assign(
+            timestamp=timestamp,
+            hour=hour,
+            day=day,
+            month=month,
+            year=year,
+            day_of_week=((days.astype(np.int64) + 3) % 7).astype(np.int32),  # 0=Monday, 6=Sunday (1970-01-01 was a Thursday)
+            entity_id=entity_id,
+            feature_timestamp=timestamp,  # Feature timestamp for Feature Store (same as timestamp)
+            aqi_change=(aqi[2:] - aqi[1:-1]).astype(np.float32),
+            aqi_roll3=((aqi[:-2] + aqi[1:-1] + aqi[2:]) / 3).astype(np.float32)
+        )
         
         print("✅ Feature engineering completed")
         return df
@@ -212,26 +300,32 @@ def main():
         print(f"❌ Configuration error: {e}")
         return
     
-    # Step 1: Fetch data from API
-    data = fetch_data()
-    if data is None:
-        print("❌ Failed to fetch data from API")
-        return
+    # Step 1: Fetch every configured feed from the API at once
+    responses = fetch_all(AQICN_URLS)
     
-    # Step 2: Parse features
-    df = parse_features(data)
-    if df is None:
-        print("❌ Failed to parse features")
-        return
-    
-    # Step 3: Engineer features
-    df = engineer_features(df)
-    if df is None:
-        print("❌ Failed to engineer features")
-        return
-    
-    # Step 4: Save to Feast Feature Store
-    success = save_to_feast(df)
+    success = True
+    for data in responses:
+        if data is None:
+            print("❌ Failed to fetch data from API")
+            success = False
+            continue
+        
+        # Step 2: Parse features
+        df = parse_features(data)
+        if df is None:
+            print("❌ Failed to parse features")
+            success = False
+            continue
+        
+        # Step 3: Engineer features
+        df = engineer_features(df)
+        if df is None:
+            print("❌ Failed to engineer features")
+            success = False
+            continue
+        
+        # Step 4: Save to Feast Feature Store
+        success = save_to_feast(df) and success
     
     if success:
         print("\n🎉 Pipeline completed successfully!")
@@ -4,6 +4,8 @@ Replaces CSV with proper database for better querying and indexing
 """
 
 import sqlite3
+import atexit
+import threading
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
@@ -11,6 +13,16 @@ from contextlib import contextmanager
 
 DB_PATH = "model_performance.db"
 
+# Columns returned by bulk reads (skips the surrogate id and created_at)
+PERFORMANCE_COLUMNS = (
+    "timestamp", "horizon", "model", "mae", "rmse", "r2", "mape", "n_test_samples", "deployed"
+)
+
+# One long-lived connection per thread (sqlite3 connections are not thread-safe)
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+
 def init_database():
     """Initialize the performance tracking database with proper schema"""
     conn = sqlite3.connect(DB_PATH)
@@ -34,9 +46,12 @@ def init_database():
     """)
     
     # Create indexes for faster queries
+    # (horizon, timestamp DESC, rmse) serves the per-horizon "latest"/"best"
+    # lookups straight from the index and supersedes the old idx_horizon
+    cursor.execute("DROP INDEX IF EXISTS idx_horizon")
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_horizon 
-        ON model_performance(horizon)
+        CREATE INDEX IF NOT EXISTS idx_horizon_ts 
+        ON model_performance(horizon, timestamp DESC, rmse ASC)
     """)
     
     cursor.execute("""
@@ -50,29 +65,53 @@ def init_database():
     """)
     
     conn.commit()
+    
+    # WAL lets dashboard reads run alongside training writes; the mode is stored in the file
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     conn.close()
     print(f"✅ Database initialized: {DB_PATH}")
 
 
+def _open_connection():
+    """Open a tuned connection and register it for closing at exit"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    
+    with _connections_lock:
+        _connections.append(conn)
+    return conn
+
+
+@atexit.register
+def _close_connections():
+    """Close every per-thread connection at process exit"""
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
+    """Context manager yielding this thread's reusable database connection"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = _open_connection()
     try:
         yield conn
-    finally:
-        conn.close()
+    except Exception:
+        # Don't leave a half-written transaction open on the shared connection
+        conn.rollback()
+        raise
 
 
-def save_performance_result(result):
-    """Save a single performance result to the database"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO model_performance 
-            (timestamp, horizon, model, mae, rmse, r2, mape, n_test_samples, deployed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+def save_performance_results(results):
+    """Save many performance results in one transaction"""
+    rows = [
+        (
             result['timestamp'],
             result['horizon'],
             result['model'],
@@ -82,10 +121,25 @@ def save_performance_result(result):
             result['mape'],
             result['n_test_samples'],
             result.get('deployed', 0)
-        ))
+        )
+        for result in results
+    ]
+    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO model_performance 
+            (timestamp, horizon, model, mae, rmse, r2, mape, n_test_samples, deployed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
         conn.commit()
 
 
+def save_performance_result(result):
+    """Save a single performance result to the database"""
+    save_performance_results([result])
+
+
 def get_latest_performance(horizon, model_name=None):
     """Get latest performance for a specific horizon and model"""
     with get_db_connection() as conn:
@@ -138,10 +192,32 @@ def get_performance_history(horizon, limit=10, model_name=None):
         return df
 
 
-def get_all_performance():
-    """Get all performance data"""
+def get_all_performance(chunksize=None):
+    """Get all performance data (an iterator of DataFrames if chunksize is set)"""
+    # The per-thread connection stays open, so a chunked iterator remains valid after the block
+    with get_db_connection() as conn:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(PERFORMANCE_COLUMNS)} FROM model_performance ORDER BY timestamp DESC",
+            conn,
+            chunksize=chunksize
+        )
+
+
+def get_overview_bundle():
+    """Get best run, two most recent runs and run count for every horizon in one query"""
     with get_db_connection() as conn:
-        return pd.read_sql_query("SELECT * FROM model_performance ORDER BY timestamp DESC", conn)
+        query = """
+            SELECT * FROM (
+                SELECT *,
+                    ROW_NUMBER() OVER (PARTITION BY horizon ORDER BY timestamp DESC, rmse ASC) AS rn_best,
+                    ROW_NUMBER() OVER (PARTITION BY horizon ORDER BY timestamp DESC) AS rn_recent,
+                    COUNT(*) OVER (PARTITION BY horizon) AS total_runs
+                FROM model_performance
+            )
+            WHERE rn_best = 1 OR rn_recent <= 2
+            ORDER BY horizon, rn_recent
+        """
+        return pd.read_sql_query(query, conn)
 
 
 def mark_as_deployed(horizon, model, timestamp):
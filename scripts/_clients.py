@@ -0,0 +1,45 @@
+"""
+Shared Google Cloud clients for the scripts
+Each is built once per process and reused by every caller
+"""
+
+from functools import lru_cache
+from google.cloud import bigquery
+from google.oauth2 import service_account
+from config import (
+    GCP_PROJECT_ID,
+    GCP_REGION,
+    GCP_SERVICE_ACCOUNT_KEY_PATH
+)
+
+@lru_cache(maxsize=1)
+def get_credentials():
+    """Parse the service-account key once"""
+    return service_account.Credentials.from_service_account_file(
+        GCP_SERVICE_ACCOUNT_KEY_PATH
+    )
+
+@lru_cache(maxsize=1)
+def get_bq_client():
+    """Build the BigQuery client (and its HTTP session pool) once"""
+    return bigquery.Client(
+        project=GCP_PROJECT_ID,
+        location=GCP_REGION,
+        credentials=get_credentials()
+    )
+
+_aiplatform_initialized = False
+
+def init_aiplatform():
+    """Initialize Vertex AI once per process"""
+    global _aiplatform_initialized
+    
+    if not _aiplatform_initialized:
+        # Imported here so BigQuery-only scripts do not need google-cloud-aiplatform
+        import google.cloud.aiplatform as aiplatform
+        aiplatform.init(
+            project=GCP_PROJECT_ID,
+            location=GCP_REGION,
+            credentials=get_credentials()
+        )
+        _aiplatform_initialized = True
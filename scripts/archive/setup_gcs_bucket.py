@@ -4,6 +4,7 @@ Creates the required GCS bucket for model artifacts manually
 """
 
 import os
+from functools import lru_cache
 from google.cloud import storage
 from google.oauth2 import service_account
 from config import (
@@ -13,28 +14,35 @@ from config import (
     MODEL_ARTIFACTS_BUCKET
 )
 
+@lru_cache(maxsize=1)
+def _client():
+    """Build the storage client once, parsing the service-account key a single time"""
+    credentials = service_account.Credentials.from_service_account_file(
+        GCP_SERVICE_ACCOUNT_KEY_PATH
+    )
+    
+    return storage.Client(
+        project=GCP_PROJECT_ID,
+        credentials=credentials
+    )
+
+@lru_cache(maxsize=1)
+def _bucket():
+    """Return the shared handle for the model artifacts bucket"""
+    return _client().bucket(MODEL_ARTIFACTS_BUCKET)
+
 def create_bucket_manually():
     """Create GCS bucket manually with proper permissions"""
     print("🪣 Creating GCS bucket for model artifacts...")
     
+    bucket_name = MODEL_ARTIFACTS_BUCKET
+    
     try:
-        # Load credentials
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        
-        # Initialize storage client
-        storage_client = storage.Client(
-            project=GCP_PROJECT_ID,
-            credentials=credentials
-        )
-        
-        bucket_name = MODEL_ARTIFACTS_BUCKET
+        storage_client = _client()
         
         # Check if bucket already exists
         try:
-            bucket = storage_client.bucket(bucket_name)
-            bucket.reload()
+            _bucket().reload()
             print(f"✅ Bucket already exists: gs://{bucket_name}")
             return True
         except Exception:
@@ -78,20 +86,10 @@ def check_bucket_permissions():
     print("🔐 Checking bucket permissions...")
     
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        
-        storage_client = storage.Client(
-            project=GCP_PROJECT_ID,
-            credentials=credentials
-        )
-        
         bucket_name = MODEL_ARTIFACTS_BUCKET
         
         # Try to access bucket
-        bucket = storage_client.bucket(bucket_name)
-        bucket.reload()
+        _bucket().reload()
         
         print(f"✅ Bucket access successful: gs://{bucket_name}")
         print(f"   📊 Bucket exists and accessible")
@@ -114,15 +112,6 @@ def test_model_upload():
     print("🧪 Testing model upload...")
     
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        
-        storage_client = storage.Client(
-            project=GCP_PROJECT_ID,
-            credentials=credentials
-        )
-        
         bucket_name = MODEL_ARTIFACTS_BUCKET
         
         # Create a test file
@@ -130,8 +119,7 @@ def test_model_upload():
         test_filename = "test_model.txt"
         
         # Upload test file
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(f"test/{test_filename}")
+        blob = _bucket().blob(f"test/{test_filename}")
         blob.upload_from_string(test_content)
         
         print(f"✅ Test upload successful!")
@@ -5,7 +5,8 @@ Quick test to verify GCS bucket and Model Registry upload works
 
 import os
 import sys
-import joblib
+import pickle
+from functools import lru_cache
 import numpy as np
 from datetime import datetime
 
@@ -23,38 +24,71 @@ from config import (
     GCS_MODEL_PATH
 )
 
+@lru_cache(maxsize=1)
+def _credentials():
+    """Parse the service-account key once"""
+    return service_account.Credentials.from_service_account_file(
+        GCP_SERVICE_ACCOUNT_KEY_PATH
+    )
+
+@lru_cache(maxsize=1)
+def _client():
+    """Build the storage client once"""
+    return storage.Client(
+        project=GCP_PROJECT_ID,
+        credentials=_credentials()
+    )
+
+@lru_cache(maxsize=1)
+def _bucket():
+    """Return the shared handle for the model artifacts bucket"""
+    return _client().bucket(MODEL_ARTIFACTS_BUCKET)
+
+_initialized = False
+
+def _init_aiplatform():
+    """Initialize Vertex AI once per process"""
+    global _initialized
+    
+    if not _initialized:
+        aiplatform.init(
+            project=GCP_PROJECT_ID,
+            location=GCP_REGION,
+            credentials=_credentials()
+        )
+        _initialized = True
+
+# Payloads above this size go through a chunked resumable upload, so a dropped
+# connection resumes from the last chunk instead of restarting the whole PUT
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
+def _blob_for_upload(bucket, blob_name, size):
+    """Return a blob handle, chunked for resumable upload when size calls for it"""
+    chunk_size = RESUMABLE_CHUNK_SIZE if size > RESUMABLE_CHUNK_SIZE else None
+    return bucket.blob(blob_name, chunk_size=chunk_size)
+
+def upload_bytes(payload, blob_name):
+    """Upload an in-memory payload straight to a blob, with no local file"""
+    blob = _blob_for_upload(_bucket(), blob_name, len(payload))
+    blob.upload_from_string(payload, content_type='application/octet-stream')
+    return blob
+
 def test_gcs_upload():
     """Test uploading a small file to GCS"""
     print("🧪 Testing GCS upload...")
     
     try:
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        
-        storage_client = storage.Client(
-            project=GCP_PROJECT_ID,
-            credentials=credentials
-        )
-        
-        # Create a test model file
+        # Create a test model payload in memory
         test_model = np.array([1, 2, 3, 4, 5])
-        test_filename = "models/test_model.pkl"
-        
-        # Save locally first
-        joblib.dump(test_model, test_filename)
         
         # Upload to GCS
-        bucket = storage_client.bucket(MODEL_ARTIFACTS_BUCKET)
-        blob = bucket.blob(f"{GCS_MODEL_PATH}/test_model.pkl")
-        blob.upload_from_filename(test_filename)
+        blob = upload_bytes(pickle.dumps(test_model, protocol=5), f"{GCS_MODEL_PATH}/test_model.pkl")
         
         gcs_uri = f"gs://{MODEL_ARTIFACTS_BUCKET}/{GCS_MODEL_PATH}/test_model.pkl"
         print(f"✅ Test upload successful!")
         print(f"   📁 GCS URI: {gcs_uri}")
         
         # Clean up
-        os.remove(test_filename)
         blob.delete()
         
         return True
@@ -69,36 +103,18 @@ def test_model_registry_upload():
     
     try:
         # Initialize Vertex AI
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        
-        aiplatform.init(
-            project=GCP_PROJECT_ID,
-            location=GCP_REGION,
-            credentials=credentials
-        )
+        _init_aiplatform()
         
         # Create a dummy model
         dummy_model = np.array([1, 2, 3, 4, 5])
-        model_filename = "models/dummy_test_model.pkl"
-        
-        # Save model locally
-        joblib.dump(dummy_model, model_filename)
         
         # Upload to GCS first - create directory structure
-        storage_client = storage.Client(
-            project=GCP_PROJECT_ID,
-            credentials=credentials
-        )
-        
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         gcs_model_dir = f"{GCS_MODEL_PATH}/test/dummy_model_v{timestamp}"
         gcs_model_path = f"{gcs_model_dir}/model.pkl"  # Standard filename
         
-        bucket = storage_client.bucket(MODEL_ARTIFACTS_BUCKET)
-        blob = bucket.blob(gcs_model_path)
-        blob.upload_from_filename(model_filename)
+        # joblib.load in the serving container reads plain pickles too
+        blob = upload_bytes(pickle.dumps(dummy_model, protocol=5), gcs_model_path)
         
         # Point to directory, not file
         gcs_uri = f"gs://{MODEL_ARTIFACTS_BUCKET}/{gcs_model_dir}/"
@@ -119,7 +135,6 @@ def test_model_registry_upload():
         print(f"   🏷️  Display Name: {display_name}")
         
         # Clean up
-        os.remove(model_filename)
         blob.delete()
         print(f"   🗑️  Cleaned up test files")
         
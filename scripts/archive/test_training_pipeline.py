@@ -2,64 +2,41 @@
 Test script for training pipeline - validates basic functionality
 """
 
+import importlib.util
+
+# (module, display name, required) checked by test_imports
+MODULES = [
+    ("pandas", "pandas", True),
+    ("numpy", "numpy", True),
+    ("sklearn", "scikit-learn", True),
+    ("joblib", "joblib", True),
+    ("google.cloud.bigquery", "google-cloud-bigquery", False),
+    ("google.cloud.aiplatform", "google-cloud-aiplatform", False),
+    ("xgboost", "xgboost", False),
+    ("matplotlib", "matplotlib", False),
+]
+
+def _module_available(name):
+    """Check a module can be located without executing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # A missing parent package (e.g. google.cloud) raises instead of returning None
+        return False
+
 def test_imports():
     """Test if all required modules can be imported"""
     print("🧪 Testing imports...")
     
-    try:
-        import pandas as pd
-        print("✅ pandas imported successfully")
-    except ImportError as e:
-        print(f"❌ pandas import failed: {e}")
-        return False
-    
-    try:
-        import numpy as np
-        print("✅ numpy imported successfully")
-    except ImportError as e:
-        print(f"❌ numpy import failed: {e}")
-        return False
-    
-    try:
-        import sklearn
-        print("✅ scikit-learn imported successfully")
-    except ImportError as e:
-        print(f"❌ scikit-learn import failed: {e}")
-        return False
-    
-    try:
-        import joblib
-        print("✅ joblib imported successfully")
-    except ImportError as e:
-        print(f"❌ joblib import failed: {e}")
-        return False
-    
-    # Test Google Cloud imports (might fail if not installed)
-    try:
-        from google.cloud import bigquery
-        print("✅ google-cloud-bigquery imported successfully")
-    except ImportError as e:
-        print(f"⚠️  google-cloud-bigquery not available: {e}")
-    
-    try:
-        from google.cloud import aiplatform
-        print("✅ google-cloud-aiplatform imported successfully")
-    except ImportError as e:
-        print(f"⚠️  google-cloud-aiplatform not available: {e}")
-    
-    # Test XGBoost (might fail if not installed)
-    try:
-        import xgboost as xgb
-        print("✅ xgboost imported successfully")
-    except ImportError as e:
-        print(f"⚠️  xgboost not available: {e}")
-    
-    # Test matplotlib (might fail if not installed)
-    try:
-        import matplotlib.pyplot as plt
-        print("✅ matplotlib imported successfully")
-    except ImportError as e:
-        print(f"⚠️  matplotlib not available: {e}")
+    # find_spec only locates each module, so heavy packages are never loaded here
+    for name, label, required in MODULES:
+        if _module_available(name):
+            print(f"✅ {label} available")
+        elif required:
+            print(f"❌ {label} not found")
+            return False
+        else:
+            print(f"⚠️  {label} not available")
     
     return True
 
@@ -93,20 +70,25 @@ def test_data_structures():
         import pandas as pd
         import numpy as np
         
-        # Create sample data
-        dates = pd.date_range('2024-01-01', periods=50, freq='H')
-        sample_data = pd.DataFrame({
-            'timestamp': dates,
-            'aqi': np.random.randint(50, 200, 50),
-            'temp': np.random.uniform(15, 35, 50),
-            'humidity': np.random.uniform(30, 90, 50)
-        })
+        # Create sample data: fill one float32 block in place and wrap it without a copy
+        rng = np.random.default_rng(0)
+        values = np.empty((50, 3), dtype=np.float32)
+        values[:, 0] = rng.integers(50, 200, 50)
+        values[:, 1] = rng.uniform(15, 35, 50)
+        values[:, 2] = rng.uniform(30, 90, 50)
+        sample_data = pd.DataFrame(values, columns=['aqi', 'temp', 'humidity'], copy=False)
+        sample_data.insert(0, 'timestamp', pd.date_range('2024-01-01', periods=50, freq='H'))
         
         print(f"✅ Sample data created: {sample_data.shape}")
         
         # Test target creation
-        sample_data['aqi_24h_ahead'] = sample_data['aqi'].shift(-24)
-        sample_data_clean = sample_data.dropna(subset=['aqi_24h_ahead'])
+        # Slice-assign into a NaN buffer instead of shift(); with no gaps in the
+        # sample, the rows with a target are exactly the leading slice
+        aqi = sample_data['aqi'].to_numpy()
+        target = np.full_like(aqi, np.nan, dtype=np.float32)
+        target[:-24] = aqi[24:]
+        sample_data['aqi_24h_ahead'] = target
+        sample_data_clean = sample_data.iloc[:-24]
         
         print(f"✅ Target creation test: {len(sample_data_clean)} records after creating 24h target")
         
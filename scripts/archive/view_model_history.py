@@ -4,11 +4,16 @@ Visualizes model performance improvements over time
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless backend, also picked up by the spawned render workers
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
+import multiprocessing as mp
 import os
 
+HORIZONS = ['24h', '48h', '72h']
+
 def load_performance_data():
     """Load model performance history"""
     try:
@@ -27,7 +32,96 @@ def load_performance_data():
         print(f"❌ Error loading performance data: {e}")
         return None
 
-def create_performance_plots(df):
+def plot_metric_trends(df, horizons, metric, marker, title, ylabel, output_file):
+    """Plot one metric over time, one panel per horizon and one line per model"""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    ax_map = dict(zip(horizons, axes))
+    
+    # One groupby pass instead of re-masking the frame per horizon and model
+    for (horizon, model), model_data in df.groupby(['horizon', 'model'], sort=False):
+        if horizon in ax_map:
+            ax_map[horizon].plot(model_data['timestamp'], model_data[metric],
+                                 marker=marker, label=model, linewidth=2, markersize=6)
+    
+    present = set(df['horizon'].unique())
+    for horizon, ax in ax_map.items():
+        if horizon not in present:
+            ax.text(0.5, 0.5, f'No data for {horizon}', 
+                    ha='center', va='center', transform=ax.transAxes)
+            ax.set_title(f'{title} - {horizon}')
+            continue
+        
+        ax.set_title(f'{title} - {horizon}', fontsize=14, fontweight='bold')
+        ax.set_xlabel('Training Date')
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        
+        # Rotate x-axis labels
+        ax.tick_params(axis='x', rotation=45)
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.close()
+
+def plot_latest_comparison(latest_data, horizons, output_file):
+    """Bar chart of the latest MAE and R² per model, one panel per horizon"""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    
+    for i, horizon in enumerate(horizons):
+        horizon_latest = latest_data[latest_data['horizon'] == horizon]
+        
+        if len(horizon_latest) == 0:
+            axes[i].text(0.5, 0.5, f'No data for {horizon}', 
+                       ha='center', va='center', transform=axes[i].transAxes)
+            axes[i].set_title(f'Latest Performance - {horizon}')
+            continue
+        
+        # Create grouped bar chart
+        x_pos = range(len(horizon_latest))
+        models = horizon_latest['model'].tolist()
+        mae_values = horizon_latest['mae'].tolist()
+        r2_values = horizon_latest['r2'].tolist()
+        
+        # Plot MAE (left axis)
+        ax1 = axes[i]
+        bars1 = ax1.bar([x - 0.2 for x in x_pos], mae_values, 0.4, 
+                      label='MAE', color='lightcoral', alpha=0.7)
+        ax1.set_xlabel('Model')
+        ax1.set_ylabel('MAE', color='red')
+        ax1.tick_params(axis='y', labelcolor='red')
+        ax1.set_xticks(x_pos)
+        ax1.set_xticklabels(models, rotation=45)
+        
+        # Plot R² (right axis)
+        ax2 = ax1.twinx()
+        bars2 = ax2.bar([x + 0.2 for x in x_pos], r2_values, 0.4, 
+                      label='R²', color='lightblue', alpha=0.7)
+        ax2.set_ylabel('R²', color='blue')
+        ax2.tick_params(axis='y', labelcolor='blue')
+        
+        axes[i].set_title(f'Latest Performance - {horizon}', fontsize=14, fontweight='bold')
+    
+    plt.tight_layout()
+    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.close()
+
+def _render(kind, data):
+    """Render one plot in a worker process and return the saved path"""
+    plt.style.use('seaborn-v0_8')
+    
+    if kind == 'mae':
+        output_file = 'outputs/performance_trends_mae.png'
+        plot_metric_trends(data, HORIZONS, 'mae', 'o', 'MAE Over Time', 'MAE (lower is better)', output_file)
+    elif kind == 'r2':
+        output_file = 'outputs/performance_trends_r2.png'
+        plot_metric_trends(data, HORIZONS, 'r2', 's', 'R² Over Time', 'R² Score (higher is better)', output_file)
+    else:
+        output_file = 'outputs/latest_performance_comparison.png'
+        plot_latest_comparison(data, HORIZONS, output_file)
+    return output_file
+
+def create_performance_plots(df, latest_data):
     """Create performance visualization plots"""
     print("📊 Creating performance plots...")
     
@@ -35,129 +129,24 @@ def create_performance_plots(df):
         # Create outputs directory
         os.makedirs('outputs', exist_ok=True)
         
-        # Set style
-        plt.style.use('seaborn-v0_8')
-        
-        # Plot 1: MAE over time for each horizon
-        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-        
-        horizons = ['24h', '48h', '72h']
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-        
-        for i, horizon in enumerate(horizons):
-            horizon_data = df[df['horizon'] == horizon]
-            
-            if len(horizon_data) == 0:
-                axes[i].text(0.5, 0.5, f'No data for {horizon}', 
-                           ha='center', va='center', transform=axes[i].transAxes)
-                axes[i].set_title(f'MAE Over Time - {horizon}')
-                continue
-            
-            for model in horizon_data['model'].unique():
-                model_data = horizon_data[horizon_data['model'] == model]
-                axes[i].plot(model_data['timestamp'], model_data['mae'], 
-                           marker='o', label=model, linewidth=2, markersize=6)
-            
-            axes[i].set_title(f'MAE Over Time - {horizon}', fontsize=14, fontweight='bold')
-            axes[i].set_xlabel('Training Date')
-            axes[i].set_ylabel('MAE (lower is better)')
-            axes[i].legend()
-            axes[i].grid(True, alpha=0.3)
-            
-            # Rotate x-axis labels
-            axes[i].tick_params(axis='x', rotation=45)
-        
-        plt.tight_layout()
-        plt.savefig('outputs/performance_trends_mae.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("✅ MAE trends plot saved: outputs/performance_trends_mae.png")
-        
-        # Plot 2: R² over time
-        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-        
-        for i, horizon in enumerate(horizons):
-            horizon_data = df[df['horizon'] == horizon]
-            
-            if len(horizon_data) == 0:
-                axes[i].text(0.5, 0.5, f'No data for {horizon}', 
-                           ha='center', va='center', transform=axes[i].transAxes)
-                axes[i].set_title(f'R² Over Time - {horizon}')
-                continue
-            
-            for model in horizon_data['model'].unique():
-                model_data = horizon_data[horizon_data['model'] == model]
-                axes[i].plot(model_data['timestamp'], model_data['r2'], 
-                           marker='s', label=model, linewidth=2, markersize=6)
-            
-            axes[i].set_title(f'R² Over Time - {horizon}', fontsize=14, fontweight='bold')
-            axes[i].set_xlabel('Training Date')
-            axes[i].set_ylabel('R² Score (higher is better)')
-            axes[i].legend()
-            axes[i].grid(True, alpha=0.3)
-            axes[i].tick_params(axis='x', rotation=45)
-        
-        plt.tight_layout()
-        plt.savefig('outputs/performance_trends_r2.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("✅ R² trends plot saved: outputs/performance_trends_r2.png")
-        
-        # Plot 3: Model comparison (latest performance)
-        latest_data = df.groupby(['horizon', 'model']).last().reset_index()
-        
-        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
-        
-        for i, horizon in enumerate(horizons):
-            horizon_latest = latest_data[latest_data['horizon'] == horizon]
-            
-            if len(horizon_latest) == 0:
-                axes[i].text(0.5, 0.5, f'No data for {horizon}', 
-                           ha='center', va='center', transform=axes[i].transAxes)
-                axes[i].set_title(f'Latest Performance - {horizon}')
-                continue
-            
-            # Create grouped bar chart
-            x_pos = range(len(horizon_latest))
-            models = horizon_latest['model'].tolist()
-            mae_values = horizon_latest['mae'].tolist()
-            r2_values = horizon_latest['r2'].tolist()
-            
-            # Plot MAE (left axis)
-            ax1 = axes[i]
-            bars1 = ax1.bar([x - 0.2 for x in x_pos], mae_values, 0.4, 
-                          label='MAE', color='lightcoral', alpha=0.7)
-            ax1.set_xlabel('Model')
-            ax1.set_ylabel('MAE', color='red')
-            ax1.tick_params(axis='y', labelcolor='red')
-            ax1.set_xticks(x_pos)
-            ax1.set_xticklabels(models, rotation=45)
-            
-            # Plot R² (right axis)
-            ax2 = ax1.twinx()
-            bars2 = ax2.bar([x + 0.2 for x in x_pos], r2_values, 0.4, 
-                          label='R²', color='lightblue', alpha=0.7)
-            ax2.set_ylabel('R²', color='blue')
-            ax2.tick_params(axis='y', labelcolor='blue')
-            
-            axes[i].set_title(f'Latest Performance - {horizon}', fontsize=14, fontweight='bold')
-        
-        plt.tight_layout()
-        plt.savefig('outputs/latest_performance_comparison.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        print("✅ Latest performance comparison saved: outputs/latest_performance_comparison.png")
+        # The three figures are independent and rendering/PNG encoding is CPU-bound,
+        # so draw them on three cores. A spawn context keeps workers free of any
+        # state inherited from the parent's matplotlib.
+        jobs = [('mae', df), ('r2', df), ('bar', latest_data)]
+        with mp.get_context('spawn').Pool(len(jobs)) as pool:
+            for output_file in pool.starmap(_render, jobs):
+                print(f"✅ Plot saved: {output_file}")
         
     except Exception as e:
         print(f"❌ Error creating plots: {e}")
 
-def print_performance_summary(df):
+def print_performance_summary(df, latest_data):
     """Print performance summary statistics"""
     print("\n" + "="*60)
     print("📊 MODEL PERFORMANCE SUMMARY")
     print("="*60)
     
     try:
-        # Latest performance for each horizon and model
-        latest_data = df.groupby(['horizon', 'model']).last().reset_index()
-        
         for horizon in ['24h', '48h', '72h']:
             horizon_data = latest_data[latest_data['horizon'] == horizon]
             
@@ -168,7 +157,7 @@ def print_performance_summary(df):
             print(f"\n🎯 {horizon} ahead predictions:")
             
             # Find best model (lowest MAE)
-            best_model = horizon_data.loc[horizon_data['mae'].idxmin()]
+            best_model = horizon_data.nsmallest(1, 'mae').iloc[0]
             
             print(f"   🏆 Best Model: {best_model['model']}")
             print(f"      MAE: {best_model['mae']:.2f}")
@@ -182,6 +171,7 @@ def print_performance_summary(df):
         
         # Performance improvement over time
         print(f"\n📈 Performance Improvement Analysis:")
+        mean_mae_by_model = df.groupby(['horizon', 'model'])['mae'].mean()
         
         for horizon in ['24h', '48h', '72h']:
             horizon_data = df[df['horizon'] == horizon]
@@ -190,7 +180,7 @@ def print_performance_summary(df):
                 continue
             
             # Find best model for this horizon
-            best_model_name = horizon_data.groupby('model')['mae'].mean().idxmin()
+            best_model_name = mean_mae_by_model.loc[horizon].idxmin()
             best_model_data = horizon_data[horizon_data['model'] == best_model_name]
             
             if len(best_model_data) >= 2:
@@ -213,11 +203,14 @@ def main():
     if df is None:
         return
     
+    # Latest run for each horizon and model, shared by the plots and the summary
+    latest_data = df.sort_values('timestamp', kind='stable').groupby(['horizon', 'model'], as_index=False).tail(1)
+    
     # Create visualizations
-    create_performance_plots(df)
+    create_performance_plots(df, latest_data)
     
     # Print summary
-    print_performance_summary(df)
+    print_performance_summary(df, latest_data)
     
     print(f"\n🎉 Dashboard completed!")
     print(f"📁 Check outputs/ directory for visualization files")
@@ -1,53 +1,234 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pyarrow import csv
 from pathlib import Path
-import os
+import queue
+import threading
 
-print("Reading CSV file...")
-csv_df = pd.read_csv("data/exported data_aqi_features.csv")
+CSV_PATH = "data/exported data_aqi_features.csv"
+LOCATION_ID = "islamabad_us_embassy"
 
-print("Parsing timestamps...")
-csv_df['timestamp'] = pd.to_datetime(csv_df['timestamp'])
+# Declared types for the Float32 measurements in feature_repo/features.py, so the
+# reader skips inference on them and writes float32 instead of float64, and for
+# the timestamp, which is parsed as ns in BigQuery's export format below.
+# The String fields are declared too: the timestamp parsers also apply to inferred
+# columns, and would otherwise turn entity_id and feature_timestamp into timestamps.
+# Only the integer-valued fields are still inferred.
+CSV_CONVERT_OPTIONS = csv.ConvertOptions(
+    column_types={
+        'timestamp': pa.timestamp('ns'),
+        **{
+            name: pa.float32()
+            for name in (
+                'pm25', 'latitude', 'longitude', 'dew', 'humidity',
+                'pressure', 'temp', 'wind_speed', 'aqi_change', 'aqi_roll3'
+            )
+        },
+        **{
+            name: pa.string()
+            for name in ('city', 'dominant_pollutant', 'entity_id', 'feature_timestamp')
+        }
+    },
+    # BigQuery exports timestamps as "2025-10-12 14:00:00 UTC", which Arrow's
+    # inference leaves as a string; naive ISO values are accepted as well
+    timestamp_parsers=['%Y-%m-%d %H:%M:%S UTC', csv.ISO8601]
+)
 
-print("Adding location id Entity...")
-csv_df['location_id'] = "islamabad_us_embassy"
+# The offline store keeps UTC-aware nanosecond timestamps (see feast_utils)
+STORE_TIMESTAMP_TYPE = pa.timestamp('ns', tz='UTC')
 
-print(f"CSV data loaded successfully with {len(csv_df)} rows")
-print(f"Date Range: {csv_df['timestamp'].min()} to {csv_df['timestamp'].max()}")
+# zstd + dictionary pages roughly halve the file versus snappy; month-sized row
+# groups (same as feast_utils.OFFLINE_ROW_GROUP_SIZE) keep timestamp statistics
+# tight enough for the training read to skip groups
+PARQUET_WRITE_OPTIONS = dict(
+    compression='zstd',
+    compression_level=3,
+    use_dictionary=True,
+    write_statistics=True,
+    data_page_size=1 << 20
+)
+ROW_GROUP_SIZE = 24 * 30
+
+def with_utc_timestamp(table):
+    """Mark the parsed (naive, UTC-valued) timestamp column as UTC"""
+    # Arrow rejects zoned column types for values without an offset such as
+    # "... UTC", so they are parsed naive and the zone is attached here
+    index = table.schema.get_field_index('timestamp')
+    return table.set_column(
+        index,
+        pa.field('timestamp', STORE_TIMESTAMP_TYPE),
+        table['timestamp'].cast(STORE_TIMESTAMP_TYPE)
+    )
+
+def with_location_id(table):
+    """Attach the constant location_id entity column"""
+    # Broadcast one dictionary entry in C++ instead of building N Python strings.
+    # The column is decoded back to plain strings so readers (Feast entity joins)
+    # see a string key, not a category; parquet's dictionary pages still store it once.
+    location_ids = pa.DictionaryArray.from_arrays(
+        pa.array(np.zeros(table.num_rows, dtype=np.int32)),
+        pa.array([LOCATION_ID])
+    ).cast(pa.string())
+    return table.append_column('location_id', location_ids)
+
+def conformed_to(table, schema):
+    """Cast the columns shared with the stored schema to its types and units"""
+    # The store may have been written by feast_utils (int32 time fields, another
+    # timestamp unit), and DataFrame.equals treats differing dtypes as unequal
+    for field in schema:
+        index = table.schema.get_field_index(field.name)
+        if index != -1 and table.schema.field(index).type != field.type:
+            table = table.set_column(index, field, table[field.name].cast(field.type))
+    return table
+
+def read_ahead(reader, depth=2):
+    """Yield reader batches while a background thread parses the next ones"""
+    # Arrow releases the GIL while parsing CSV and while encoding parquet, so a
+    # thread overlaps the two without pickling batches across processes
+    batches = queue.Queue(maxsize=depth)
+    
+    def produce():
+        try:
+            for batch in reader:
+                batches.put(batch)
+        except Exception as e:
+            batches.put(e)
+        batches.put(None)
+    
+    threading.Thread(target=produce, daemon=True).start()
+    while (batch := batches.get()) is not None:
+        if isinstance(batch, Exception):
+            raise batch
+        yield batch
+
+def timestamp_ns(series):
+    """Timestamps as UTC int64 nanoseconds, whatever their unit or timezone"""
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        raise TypeError(
+            f"Expected a datetime timestamp column, got {series.dtype}; "
+            "check the CSV timestamp format"
+        )
+    if series.dt.tz is not None:
+        series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+    return series.to_numpy(dtype='datetime64[ns]').view('i8')
 
 # Ensure output directory exists
-Path('feature_repo/data').mkdir(parents=True, exist_ok=True)
-output_path = 'feature_repo/data/aqi_features.parquet'
+output_dir = Path('feature_repo/data')
+output_dir.mkdir(parents=True, exist_ok=True)
+output_path = output_dir / 'aqi_features.parquet'
 
 # Check if parquet file already exists
-if os.path.exists(output_path):
+if output_path.exists():
+    print("Reading CSV file (adding location id Entity)...")
+    # Arrow's multithreaded C++ reader parses the export's timestamps while
+    # reading, so there is no separate pd.to_datetime pass over string objects
+    csv_table = with_location_id(with_utc_timestamp(
+        csv.read_csv(CSV_PATH, convert_options=CSV_CONVERT_OPTIONS)
+    ))
+    
+    csv_range = pc.min_max(csv_table['timestamp'])
+    print(f"CSV data loaded successfully with {csv_table.num_rows} rows")
+    print(f"Date Range: {csv_range['min']} to {csv_range['max']}")
+    
     print(f"\nExisting parquet file found at {output_path}")
     print("Loading existing data...")
     existing_df = pd.read_parquet(output_path)
-    print(f"Existing records: {len(existing_df)}")
+    csv_df = conformed_to(csv_table, pq.read_schema(output_path)).to_pandas()
+    existing_count = len(existing_df)
+    print(f"Existing records: {existing_count}")
     print(f"Existing date range: {existing_df['timestamp'].min()} to {existing_df['timestamp'].max()}")
     
     # Merge dataframes, removing duplicates by timestamp (keep newer data)
     print("\nMerging data...")
-    combined_df = pd.concat([existing_df, csv_df], ignore_index=True)
+    # Only the CSV side needs sorting/de-duplicating; the existing store is already
+    # sorted and unique, so drop just the stored rows the CSV replaces
+    # Both sides are compared as sorted int64 nanoseconds: de-duplication is a
+    # neighbour comparison and membership a binary search, with no hash table
+    csv_df = csv_df.sort_values('timestamp', kind='stable')
+    csv_ts = timestamp_ns(csv_df['timestamp'])
+    is_last = np.append(csv_ts[1:] != csv_ts[:-1], True)[:len(csv_ts)]
+    csv_df, csv_ts = csv_df[is_last], csv_ts[is_last]
     
-    # Remove duplicates based on timestamp, keeping the last occurrence (newer data)
-    combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
-    combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
+    existing_ts = timestamp_ns(existing_df['timestamp'])
+    idx = np.minimum(np.searchsorted(csv_ts, existing_ts), max(len(csv_ts) - 1, 0))
+    replaced = (csv_ts[idx] == existing_ts) if len(csv_ts) else np.zeros(len(existing_ts), dtype=bool)
     
-    print(f"Merge complete:")
-    print(f"   Total records after merge: {len(combined_df)}")
-    print(f"   New date range: {combined_df['timestamp'].min()} to {combined_df['timestamp'].max()}")
-    print(f"   Records added: {len(combined_df) - len(existing_df)}")
-    
-    df = combined_df
+    # Re-running on an export that is already imported is the common case; when
+    # every CSV row is stored unchanged, keep the file instead of rewriting it
+    unchanged = (
+        replaced.sum() == len(csv_ts)
+        and set(csv_df.columns) == set(existing_df.columns)
+        and existing_df[replaced].reset_index(drop=True).equals(
+            csv_df[existing_df.columns].reset_index(drop=True))
+    )
+    if unchanged:
+        print("No new or changed records in the CSV; keeping the existing file")
+        total_rows = existing_count
+    else:
+        existing_df = existing_df[~replaced]
+        combined_df = pd.concat([existing_df, csv_df], ignore_index=True)
+        
+        # A CSV that only extends the history is already in order; sort only if they interleave
+        if not combined_df['timestamp'].is_monotonic_increasing:
+            combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
+        
+        print(f"Merge complete:")
+        print(f"   Total records after merge: {len(combined_df)}")
+        print(f"   New date range: {combined_df['timestamp'].min()} to {combined_df['timestamp'].max()}")
+        print(f"   Records added: {len(combined_df) - existing_count}")
+        
+        print(f"\nSaving to {output_path}...")
+        pq.write_table(
+            pa.Table.from_pandas(combined_df, preserve_index=False),
+            output_path,
+            row_group_size=ROW_GROUP_SIZE,
+            **PARQUET_WRITE_OPTIONS
+        )
+        total_rows = len(combined_df)
 else:
     print(f"\nNo existing parquet file found. Creating new one...")
-    df = csv_df
+    # Nothing to merge against, so stream CSV blocks straight into parquet
+    # row groups; peak memory stays at one 64 MB block instead of the whole file
+    print("Streaming CSV file (adding location id Entity)...")
+    reader = csv.open_csv(
+        CSV_PATH,
+        read_options=csv.ReadOptions(block_size=64 << 20),
+        convert_options=CSV_CONVERT_OPTIONS
+    )
+    # Build the writer schema from the declared column types rather than trusting
+    # inference, and fail fast if the timestamp still did not parse as one
+    if not pa.types.is_timestamp(reader.schema.field('timestamp').type):
+        raise TypeError(
+            f"CSV timestamp column parsed as {reader.schema.field('timestamp').type}; "
+            "check CSV_CONVERT_OPTIONS timestamp_parsers"
+        )
+    schema = with_utc_timestamp(reader.schema.empty_table()).schema.append(
+        pa.field('location_id', pa.string())
+    )
+    
+    total_rows, ts_min, ts_max = 0, None, None
+    with pq.ParquetWriter(output_path, schema, **PARQUET_WRITE_OPTIONS) as writer:
+        for batch in read_ahead(reader):
+            if batch.num_rows == 0:
+                continue
+            table = with_location_id(with_utc_timestamp(pa.Table.from_batches([batch])))
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+            
+            batch_range = pc.min_max(table['timestamp'])
+            ts_min = batch_range['min'].as_py() if ts_min is None else min(ts_min, batch_range['min'].as_py())
+            ts_max = batch_range['max'].as_py() if ts_max is None else max(ts_max, batch_range['max'].as_py())
+            total_rows += table.num_rows
+    
+    print(f"CSV data loaded successfully with {total_rows} rows")
+    print(f"Date Range: {ts_min} to {ts_max}")
+    print(f"Saved to {output_path}")
 
-print(f"\nSaving to {output_path}...")
-df.to_parquet(output_path, index=False)
 print("Converted CSV to Parquet successfully")
 
-file_size = os.path.getsize(output_path) / (1024 * 1024)
+# Stat the file written above; the existence check ran before the rewrite
+file_size = output_path.stat().st_size / (1024 * 1024)
 print(f"File size: {file_size:.2f} MB")
-print(f"Final record count: {len(df)}")
+print(f"Final record count: {total_rows}")
\ No newline at end of file
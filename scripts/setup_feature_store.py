@@ -1,10 +1,8 @@
-import google.cloud.aiplatform as aiplatform
 import google.cloud.bigquery as bigquery
-from google.oauth2 import service_account
+from _clients import get_bq_client, init_aiplatform
 from config import (
     GCP_PROJECT_ID,
     GCP_REGION,
-    GCP_SERVICE_ACCOUNT_KEY_PATH,
     BIGQUERY_DATASET_ID,
     BIGQUERY_TABLE_ID,
     FEATURE_GROUP_ID,
@@ -13,29 +11,40 @@ from config import (
 )
 
 def setup_feature_store():
-    # Load service account credentials
-    credentials = service_account.Credentials.from_service_account_file(
-        GCP_SERVICE_ACCOUNT_KEY_PATH
-    )
     # Initialize Vertex AI with service account credentials
-    aiplatform.init(project=GCP_PROJECT_ID, location=GCP_REGION, credentials=credentials)
+    init_aiplatform()
     print(f"✅ Vertex AI initialized in project '{GCP_PROJECT_ID}' ({GCP_REGION})")
     
     # Initialize BigQuery client with credentials
-    bigquery_client = bigquery.Client(project=GCP_PROJECT_ID, location=GCP_REGION, credentials=credentials)
+    bigquery_client = get_bq_client()
     print(f"✅ BigQuery client initialized")
     
     # Verify BigQuery table exists and has correct schema
+    # One INFORMATION_SCHEMA query returns just the column names; a table that
+    # does not exist simply has none
     table_path = f"{GCP_PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}"
+    columns_query = f"""
+    SELECT column_name
+    FROM `{GCP_PROJECT_ID}.{BIGQUERY_DATASET_ID}.INFORMATION_SCHEMA.COLUMNS`
+    WHERE table_name = @table_name
+    ORDER BY ordinal_position
+    """
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ScalarQueryParameter('table_name', 'STRING', BIGQUERY_TABLE_ID)]
+    )
     try:
-        table = bigquery_client.get_table(table_path)
-        print(f"✅ BigQuery table found: {table_path}")
+        rows = bigquery_client.query_and_wait(columns_query, job_config=job_config)
+        actual_columns = [row.column_name for row in rows]
     except Exception as e:
-        print(f"❌ Error: Could not find table {table_path}: {e}")
+        print(f"❌ Error: Could not read columns of {table_path}: {e}")
+        return
+    
+    if not actual_columns:
+        print(f"❌ Error: Could not find table {table_path}")
         return
+    print(f"✅ BigQuery table found: {table_path}")
     
     # Validate schema (check for Feature Store required columns)
-    actual_columns = [field.name for field in table.schema]
     print(f"📋 Table columns: {actual_columns}")
     
     # Check for Feature Store required columns
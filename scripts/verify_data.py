@@ -5,6 +5,8 @@ Verifies data in BigQuery and provides Feature Store verification steps
 
 import sys
 import os
+import importlib.util
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Add parent directory to Python path to import config
@@ -12,15 +14,20 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
 from google.cloud import bigquery
-from google.oauth2 import service_account
+from _clients import get_bq_client
 from config import (
     GCP_PROJECT_ID, 
     GCP_REGION, 
-    GCP_SERVICE_ACCOUNT_KEY_PATH, 
     BIGQUERY_DATASET_ID, 
     BIGQUERY_TABLE_ID
 )
 
+# Refuse to run the verification query if it would bill more than this
+MAX_BYTES_BILLED = 1024 ** 3
+
+# Results come back as Arrow; the Storage Read API is used when its client is installed
+HAS_BQSTORAGE = importlib.util.find_spec("google.cloud.bigquery_storage") is not None
+
 def verify_bigquery_data():
     """Verify data in BigQuery table"""
     print("🔍 Verifying BigQuery Data")
@@ -28,14 +35,7 @@ def verify_bigquery_data():
     
     try:
         # Initialize BigQuery client
-        credentials = service_account.Credentials.from_service_account_file(
-            GCP_SERVICE_ACCOUNT_KEY_PATH
-        )
-        bq_client = bigquery.Client(
-            project=GCP_PROJECT_ID, 
-            location=GCP_REGION, 
-            credentials=credentials
-        )
+        bq_client = get_bq_client()
         
         # Query the latest data (with partition filter for partitioned table)
         query = f"""
@@ -48,31 +48,43 @@ def verify_bigquery_data():
             pm25,
             temp,
             humidity,
-            pressure,
             wind_speed
         FROM `{GCP_PROJECT_ID}.{BIGQUERY_DATASET_ID}.{BIGQUERY_TABLE_ID}`
-        WHERE timestamp >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL 7 DAY)
+        WHERE timestamp >= @cutoff
         ORDER BY timestamp DESC
         LIMIT 5
         """
         
+        # A literal cutoff (unlike CURRENT_TIMESTAMP()) lets BigQuery prune
+        # partitions when planning the query
+        cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ScalarQueryParameter('cutoff', 'TIMESTAMP', cutoff)],
+            maximum_bytes_billed=MAX_BYTES_BILLED
+        )
+        
         print("📊 Querying BigQuery table...")
-        results = bq_client.query(query).result()
+        results = bq_client.query_and_wait(query, job_config=job_config).to_arrow(
+            create_bqstorage_client=HAS_BQSTORAGE
+        )
         
         row_count = 0
-        for row in results:
+        for row in results.to_pylist():
             row_count += 1
-            print(f"\n📋 Record #{row_count}:")
-            print(f"   📅 Timestamp: {row.timestamp}")
-            print(f"   🆔 Entity ID: {row.entity_id}")
-            print(f"   🏷️  Feature Timestamp: {row.feature_timestamp}")
-            print(f"   🏙️  City: {row.city}")
-            print(f"   📊 AQI: {row.aqi}")
-            print(f"   🌫️  PM2.5: {row.pm25}")
-            print(f"   🌡️  Temperature: {row.temp}°C")
-            print(f"   💧 Humidity: {row.humidity}%")
-            print(f"   🌬️  Wind Speed: {row.wind_speed}")
-            print("-" * 50)
+            # One write per record instead of one per field
+            print("\n".join([
+                f"\n📋 Record #{row_count}:",
+                f"   📅 Timestamp: {row['timestamp']}",
+                f"   🆔 Entity ID: {row['entity_id']}",
+                f"   🏷️  Feature Timestamp: {row['feature_timestamp']}",
+                f"   🏙️  City: {row['city']}",
+                f"   📊 AQI: {row['aqi']}",
+                f"   🌫️  PM2.5: {row['pm25']}",
+                f"   🌡️  Temperature: {row['temp']}°C",
+                f"   💧 Humidity: {row['humidity']}%",
+                f"   🌬️  Wind Speed: {row['wind_speed']}",
+                "-" * 50
+            ]))
         
         if row_count > 0:
             print(f"\n✅ SUCCESS: Found {row_count} records in BigQuery")
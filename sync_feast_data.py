@@ -8,49 +8,180 @@ Usage:
   python sync_feast_data.py --weekly              # Sync latest run from this week
 """
 
+import io
 import os
 import sys
+import platform
 import subprocess
 import zipfile
 import shutil
 import argparse
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timedelta
-from feast_utils import materialize_to_online_store
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from feast_utils import materialize_to_online_store, get_stored_timestamp_range, OFFLINE_ROW_GROUP_SIZE, OFFLINE_WRITE_OPTIONS
+
+GITHUB_API = "https://api.github.com"
+WORKFLOW_FILE = "feature-pipeline.yml"
+ARTIFACT_FILES = ("aqi_features.parquet", "registry.db")
+
+# Concurrent artifact downloads; the API session pools a connection per stream
+DOWNLOAD_WORKERS = min(8, os.cpu_count() or 4)
+
+# Archives above this size are fetched as parallel byte ranges, this many per archive
+RANGE_DOWNLOAD_THRESHOLD = 8 * 1024 * 1024
+RANGE_STREAMS = 4
+
+# Use full path to gh.exe on Windows
+GH_CMD = r"C:\Program Files\GitHub CLI\gh.exe" if platform.system() == "Windows" else "gh"
+
+def _run_gh(*args):
+    """Run a gh CLI command and return its stripped stdout (raises CalledProcessError)"""
+    return subprocess.run([GH_CMD, *args], capture_output=True, text=True, check=True).stdout.strip()
+
+@lru_cache(maxsize=1)
+def _github_api():
+    """Return (owner/repo, authenticated session), asking the gh CLI only once"""
+    # The CLI is still the source of the login and the repository, but the
+    # API calls themselves go over one pooled HTTPS session instead of a
+    # Go process per command
+    token = _run_gh("auth", "token")
+    repo = _run_gh("repo", "view", "--json", "nameWithOwner", "--jq", ".nameWithOwner")
+    
+    # Kept-alive connections are shared by the runs list and every artifact
+    # download (API host and blob host), with retries on transient failures
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
+        "X-GitHub-Api-Version": "2022-11-28"
+    })
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=DOWNLOAD_WORKERS * RANGE_STREAMS,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    ))
+    return repo, session
+
+def _fetch_archive(session, url):
+    """Fetch an artifact zip into memory, as parallel byte ranges when the blob allows it"""
+    # Resolve the signed blob URL once so every request goes straight to blob
+    # storage; that URL carries its own credentials and the host rejects ours
+    redirect = session.get(url, allow_redirects=False, timeout=30)
+    redirect.raise_for_status()
+    if "Location" not in redirect.headers:
+        return io.BytesIO(redirect.content)
+    blob_url = redirect.headers["Location"]
+    no_auth = {"Authorization": None}
+    
+    head = session.head(blob_url, headers=no_auth, timeout=30)
+    size = int(head.headers.get("Content-Length", 0))
+    if head.ok and head.headers.get("Accept-Ranges") == "bytes" and size > RANGE_DOWNLOAD_THRESHOLD:
+        buffer = bytearray(size)
+        step = -(-size // RANGE_STREAMS)
+        
+        def fetch_range(start):
+            end = min(start + step, size) - 1
+            response = session.get(
+                blob_url, headers={**no_auth, "Range": f"bytes={start}-{end}"}, timeout=60
+            )
+            response.raise_for_status()
+            if response.status_code != 206 or len(response.content) != end - start + 1:
+                raise requests.HTTPError(f"Range {start}-{end} not honoured")
+            buffer[start:end + 1] = response.content
+        
+        try:
+            with ThreadPoolExecutor(max_workers=RANGE_STREAMS) as executor:
+                list(executor.map(fetch_range, range(0, size, step)))
+            return io.BytesIO(buffer)
+        except requests.RequestException as e:
+            print(f"⚠️  Range download failed ({e}), retrying as a single stream")
+    
+    archive = io.BytesIO()
+    with session.get(blob_url, headers=no_auth, stream=True, timeout=60) as download:
+        download.raise_for_status()
+        for chunk in download.iter_content(chunk_size=1024 * 1024):
+            archive.write(chunk)
+    return archive
+
+def download_run_artifact(run_id, artifact_name, dest_dir):
+    """Download a run's artifact zip over the REST API and extract it into dest_dir"""
+    repo, session = _github_api()
+    response = session.get(
+        f"{GITHUB_API}/repos/{repo}/actions/runs/{run_id}/artifacts",
+        params={"name": artifact_name}, timeout=30
+    )
+    response.raise_for_status()
+    artifacts = orjson.loads(response.content)["artifacts"]
+    if not artifacts:
+        raise LookupError(f"Artifact {artifact_name} not found for run {run_id}")
+    
+    # Buffer the zip in memory and extract from there, so the archive itself is
+    # never written to and re-read from disk
+    archive = _fetch_archive(session, artifacts[0]["archive_download_url"])
+    
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Pull out only the files the sync uses, streaming each member straight to
+    # its flat destination instead of extracting the whole archive
+    with zipfile.ZipFile(archive) as zf:
+        for member in zf.infolist():
+            name = Path(member.filename).name
+            if name in ARTIFACT_FILES:
+                with zf.open(member) as src, open(dest_dir / name, "wb") as dst:
+                    shutil.copyfileobj(src, dst, length=1024 * 1024)
+
+# Workflow runs per days_back window; one sync asks for the same window more than once
+_runs_cache = {}
 
 def get_workflow_runs(days_back=1):
     """Get workflow runs from the last N days"""
+    if days_back in _runs_cache:
+        return _runs_cache[days_back]
+    
     try:
-        # Use full path to gh.exe on Windows
-        import platform
-        if platform.system() == "Windows":
-            gh_cmd = r"C:\Program Files\GitHub CLI\gh.exe"
-        else:
-            gh_cmd = "gh"
-            
-        result = subprocess.run([
-            gh_cmd, "run", "list", "--workflow=feature-pipeline.yml", 
-            f"--limit=100", "--json", "number,status,createdAt,databaseId"
-        ], capture_output=True, text=True, check=True)
-        
-        import json
-        runs = json.loads(result.stdout)
+        params = {"per_page": 100}
         
-        # Filter by date if specified
+        # Let the API filter by creation time instead of parsing every run's
+        # createdAt here; the cutoff is in UTC to match GitHub's timestamps
         if days_back:
-            # Create timezone-aware cutoff_date in UTC to match GitHub API response
             from datetime import timezone
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
-            filtered_runs = []
-            for run in runs:
-                run_date = datetime.fromisoformat(run["createdAt"].replace("Z", "+00:00"))
-                if run_date >= cutoff_date:
-                    filtered_runs.append(run)
-            return filtered_runs
+            params["created"] = f">={cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        
+        repo, session = _github_api()
+        response = session.get(
+            f"{GITHUB_API}/repos/{repo}/actions/workflows/{WORKFLOW_FILE}/runs",
+            params=params, timeout=30
+        )
+        response.raise_for_status()
+        
+        # Same keys the gh CLI's --json output used, so callers are unchanged
+        runs = [
+            {
+                "number": run["run_number"],
+                "status": run["status"],
+                "createdAt": run["created_at"],
+                "databaseId": run["id"]
+            }
+            for run in orjson.loads(response.content)["workflow_runs"]
+        ]
         
+        _runs_cache[days_back] = runs
         return runs
         
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, requests.RequestException) as e:
         print(f"❌ Error getting workflow runs: {e}")
         return []
 
@@ -72,7 +203,8 @@ def download_artifact(run_number=None, days_back=None):
                 print(f"❌ No completed runs found in the last {days_back} days")
                 return False
             
-            run_number = completed_runs[0]["databaseId"]  # Use databaseId instead of number
+            run_data = completed_runs[0]
+            run_number = run_data["databaseId"]  # Use databaseId instead of number
             print(f"✅ Found latest run from last {days_back} days: {run_number}")
             
         elif run_number is None:
@@ -82,51 +214,36 @@ def download_artifact(run_number=None, days_back=None):
                 print("❌ No workflow runs found")
                 return False
                 
-            run_number = runs[0]["databaseId"]  # Use databaseId instead of number
-            status = runs[0]["status"]
+            run_data = runs[0]
+            run_number = run_data["databaseId"]  # Use databaseId instead of number
+            status = run_data["status"]
             
             if status != "completed":
                 print(f"⚠️  Latest run {run_number} status: {status}")
                 return False
                 
             print(f"✅ Found latest run: {run_number}")
+            
+        else:
+            run_data = get_workflow_runs(1)[0]
         
         # Download the artifact
-        # The artifact name uses the run number, but we need the run ID to download
-        # Get the run number from the run data
-        run_data = None
-        if days_back:
-            runs = get_workflow_runs(days_back)
-            completed_runs = [r for r in runs if r["status"] == "completed"]
-            run_data = completed_runs[0]
-        else:
-            runs = get_workflow_runs(1)
-            run_data = runs[0]
-            
+        # The artifact name uses the run number, but we need the run ID to download;
+        # the run data found above already carries both
         artifact_name = f"feast-offline-store-{run_data['number']}"
         print(f"📥 Downloading artifact: {artifact_name}")
         
-        # Use full path to gh.exe on Windows
-        import platform
-        if platform.system() == "Windows":
-            gh_cmd = r"C:\Program Files\GitHub CLI\gh.exe"
-        else:
-            gh_cmd = "gh"
-        
         # Clean up temp directory before downloading
         temp_dir = Path("temp_artifacts")
         if temp_dir.exists():
             shutil.rmtree(temp_dir)
         
-        subprocess.run([
-            gh_cmd, "run", "download", str(run_number), 
-            "-n", artifact_name, "-D", "temp_artifacts"
-        ], check=True)
+        download_run_artifact(run_number, artifact_name, temp_dir)
         
         print("✅ Artifact downloaded successfully")
         return True
         
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, requests.RequestException, LookupError) as e:
         print(f"❌ Error downloading artifact: {e}")
         return False
     except FileNotFoundError:
@@ -134,6 +251,77 @@ def download_artifact(run_number=None, days_back=None):
         print("   https://cli.github.com/")
         return False
 
+def move_file(src, dst):
+    """Move a downloaded file into place, renaming when possible instead of copying"""
+    # The temp directory is deleted afterwards, so the source need not survive;
+    # a rename moves no data, and copy2 is only needed across filesystems
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def merge_tables(existing, new):
+    """Union two feature tables by timestamp, keeping the new row on conflicts"""
+    # Keep the last occurrence of each timestamp within the new table
+    latest = (
+        new.append_column('__row', pa.array(np.arange(new.num_rows)))
+        .group_by('timestamp')
+        .aggregate([('__row', 'max')])
+    )
+    # A mask (not take) keeps the surviving rows in their original, sorted order
+    keep = np.zeros(new.num_rows, dtype=bool)
+    keep[latest['__row_max'].to_numpy()] = True
+    new = new.filter(pa.array(keep))
+    
+    # Drop the stored rows the new table replaces, then order the union
+    replaced = pc.is_in(
+        existing['timestamp'],
+        value_set=new['timestamp'].cast(existing.schema.field('timestamp').type)
+    )
+    combined = pa.concat_tables(
+        [existing.filter(pc.invert(replaced)), new],
+        promote_options="permissive"
+    )
+    
+    # Both inputs are stored sorted and a sync usually only extends the history,
+    # so the union is normally in order already; a linear check replaces the sort
+    timestamps = combined['timestamp']
+    if combined.num_rows > 1 and not pc.all(pc.greater_equal(
+        timestamps.slice(1), timestamps.slice(0, combined.num_rows - 1)
+    )).as_py():
+        combined = combined.sort_by('timestamp')
+    return combined
+
+def write_parquet(table, path):
+    """Stream a table into parquet one row group at a time"""
+    # Same row-group size as the feature pipeline's appends, so footer timestamp
+    # statistics stay tight for readers that skip row groups
+    # merge_tables returns rows in timestamp order; declare it in the footer
+    sorting_columns = [pq.SortingColumn(table.schema.get_field_index('timestamp'))]
+    with pq.ParquetWriter(path, table.schema, sorting_columns=sorting_columns, **OFFLINE_WRITE_OPTIONS) as writer:
+        for batch in table.to_batches(max_chunksize=OFFLINE_ROW_GROUP_SIZE):
+            writer.write_batch(batch, row_group_size=OFFLINE_ROW_GROUP_SIZE)
+
+def merge_parquet(parquet_src, parquet_dst):
+    """Merge a downloaded store into the local one, all in Arrow"""
+    existing = pq.read_table(parquet_dst)
+    new = pq.read_table(parquet_src)
+    existing_range = pc.min_max(existing['timestamp'])
+    new_range = pc.min_max(new['timestamp'])
+    
+    print(f"   Existing records: {existing.num_rows}")
+    print(f"   New records: {new.num_rows}")
+    print(f"   Existing date range: {existing_range['min']} to {existing_range['max']}")
+    print(f"   New date range: {new_range['min']} to {new_range['max']}")
+    
+    combined = merge_tables(existing, new)
+    
+    print(f"   Merge complete:")
+    print(f"      Total records after merge: {combined.num_rows}")
+    print(f"      Records added: {combined.num_rows - existing.num_rows}")
+    
+    write_parquet(combined, parquet_dst)
+
 def extract_and_sync():
     """Sync downloaded files to local Feast store"""
     print("📦 Syncing data...")
@@ -158,31 +346,12 @@ def extract_and_sync():
             if parquet_dst.exists():
                 print(f"Existing parquet file found. Merging with new data...")
                 
-                # Load both dataframes
-                import pandas as pd
-                existing_df = pd.read_parquet(parquet_dst)
-                new_df = pd.read_parquet(parquet_src)
-                
-                print(f"   Existing records: {len(existing_df)}")
-                print(f"   New records: {len(new_df)}")
-                print(f"   Existing date range: {existing_df['timestamp'].min()} to {existing_df['timestamp'].max()}")
-                print(f"   New date range: {new_df['timestamp'].min()} to {new_df['timestamp'].max()}")
-                
-                # Merge dataframes, removing duplicates by timestamp (keep newer data)
-                combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                combined_df = combined_df.drop_duplicates(subset=['timestamp'], keep='last')
-                combined_df = combined_df.sort_values('timestamp').reset_index(drop=True)
-                
-                print(f"   Merge complete:")
-                print(f"      Total records after merge: {len(combined_df)}")
-                print(f"      Records added: {len(combined_df) - len(existing_df)}")
-                
-                # Save merged data
-                combined_df.to_parquet(parquet_dst, index=False)
+                # Merge by timestamp (keep newer data) and save
+                merge_parquet(parquet_src, parquet_dst)
                 print(f"Synced (merged): {parquet_dst}")
             else:
                 # No existing file, just copy
-                shutil.copy2(parquet_src, parquet_dst)
+                move_file(parquet_src, parquet_dst)
                 print(f"Synced (new): {parquet_dst}")
         else:
             print("No parquet file found in artifact")
@@ -192,7 +361,7 @@ def extract_and_sync():
         registry_dst = feast_data_dir / "registry.db"
         
         if registry_src.exists():
-            shutil.copy2(registry_src, registry_dst)
+            move_file(registry_src, registry_dst)
             print(f"✅ Synced: {registry_dst}")
         else:
             print("⚠️  No registry file found in artifact")
@@ -207,70 +376,67 @@ def extract_and_sync():
         print(f"❌ Error syncing: {e}")
         return False
 
-def extract_and_sync_from_dir(temp_dir: Path) -> bool:
-    """Sync files from a specified temp directory to local Feast store.
-    Reuses the same merge logic as extract_and_sync(), but parameterized by source dir.
+def collect_from_dir(temp_dir: Path):
+    """Load a downloaded run's features and sync its registry to the local Feast store.
+    Returns the run's feature table, or None if it has none or could not be read.
     """
-    print("📦 Syncing data from", temp_dir)
+    print("📦 Collecting data from", temp_dir)
     try:
-        if not temp_dir.exists():
-            print(f"❌ No directory found: {temp_dir}")
-            return False
-
         feast_data_dir = Path("feature_repo/data")
         feast_data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Parquet
-        parquet_src = temp_dir / "aqi_features.parquet"
-        parquet_dst = feast_data_dir / "aqi_features.parquet"
-
-        if parquet_src.exists():
-            import pandas as pd
-            if parquet_dst.exists():
-                print("Existing parquet file found. Merging with new data...")
-                existing_df = pd.read_parquet(parquet_dst)
-                new_df = pd.read_parquet(parquet_src)
-                print(f"   Existing records: {len(existing_df)}")
-                print(f"   New records: {len(new_df)}")
-                print(f"   Existing date range: {existing_df['timestamp'].min()} to {existing_df['timestamp'].max()}")
-                print(f"   New date range: {new_df['timestamp'].min()} to {new_df['timestamp'].max()}")
-
-                combined_df = (
-                    pd.concat([existing_df, new_df], ignore_index=True)
-                    .drop_duplicates(subset=["timestamp"], keep="last")
-                    .sort_values("timestamp")
-                    .reset_index(drop=True)
-                )
-                print("   Merge complete:")
-                print(f"      Total records after merge: {len(combined_df)}")
-                print(f"      Records added: {len(combined_df) - len(existing_df)}")
-                combined_df.to_parquet(parquet_dst, index=False)
-                print(f"Synced (merged): {parquet_dst}")
-            else:
-                shutil.copy2(parquet_src, parquet_dst)
-                print(f"Synced (new): {parquet_dst}")
-        else:
-            print("No parquet file found in artifact directory")
-
-        # Registry: copy last one (optional)
+        # Registry: copy last one (optional); runs arrive oldest → newest
         registry_src = temp_dir / "registry.db"
         registry_dst = feast_data_dir / "registry.db"
         if registry_src.exists():
-            shutil.copy2(registry_src, registry_dst)
+            move_file(registry_src, registry_dst)
             print(f"✅ Synced: {registry_dst}")
 
+        parquet_src = temp_dir / "aqi_features.parquet"
+        if not parquet_src.exists():
+            print("No parquet file found in artifact directory")
+            return None
+        return pq.read_table(parquet_src)
+    except Exception as e:
+        print(f"❌ Error collecting from {temp_dir}: {e}")
+        return None
+
+def finalize_merge(new_tables) -> bool:
+    """Merge every downloaded table (oldest first) into the local store in one pass.
+    The existing store is read once and written once, however many runs are merged.
+    """
+    print(f"📦 Merging {len(new_tables)} runs into the local store...")
+    try:
+        parquet_dst = Path("feature_repo/data/aqi_features.parquet")
+        new = pa.concat_tables(new_tables, promote_options="permissive")
+
+        if parquet_dst.exists():
+            existing = pq.read_table(parquet_dst)
+        else:
+            existing = new.schema.empty_table()
+        print(f"   Existing records: {existing.num_rows}")
+        print(f"   New records: {new.num_rows}")
+
+        # Later runs come later in `new`, so their rows win duplicate timestamps
+        combined = merge_tables(existing, new)
+        print(f"   Merge complete:")
+        print(f"      Total records after merge: {combined.num_rows}")
+        print(f"      Records added: {combined.num_rows - existing.num_rows}")
+
+        write_parquet(combined, parquet_dst)
+        print(f"Synced (merged): {parquet_dst}")
         return True
     except Exception as e:
-        print(f"❌ Error syncing from {temp_dir}: {e}")
+        print(f"❌ Error merging runs: {e}")
         return False
 
-def process_run(run: dict) -> bool:
-    """Download and merge artifacts for a single workflow run.
+def fetch_run(run: dict):
+    """Download the artifacts for a single workflow run into its own temp directory.
     Expects a dict with keys: databaseId (run id), number (run number), createdAt, status.
+    Returns the directory, or None if the download failed.
     """
+    tmp_dir = None
     try:
-        import platform
-        gh_cmd = r"C:\\Program Files\\GitHub CLI\\gh.exe" if platform.system() == "Windows" else "gh"
         run_id = run["databaseId"]
         run_number = run["number"]
 
@@ -281,17 +447,16 @@ def process_run(run: dict) -> bool:
         tmp_dir.mkdir(parents=True, exist_ok=True)
 
         print(f"📥 Downloading artifact for run {run_number} (id={run_id}): {artifact_name}")
-        subprocess.run([gh_cmd, "run", "download", str(run_id), "-n", artifact_name, "-D", str(tmp_dir)], check=True)
-
-        ok = extract_and_sync_from_dir(tmp_dir)
-        shutil.rmtree(tmp_dir, ignore_errors=True)
-        return ok
-    except subprocess.CalledProcessError as e:
+        download_run_artifact(run_id, artifact_name, tmp_dir)
+        return tmp_dir
+    except (subprocess.CalledProcessError, requests.RequestException, LookupError) as e:
         print(f"❌ Error downloading artifact for run {run.get('number')}: {e}")
-        return False
     except Exception as e:
         print(f"❌ Error processing run {run.get('number')}: {e}")
-        return False
+    
+    if tmp_dir is not None:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return None
 
 def verify_sync():
     """Verify the sync worked by checking data"""
@@ -299,20 +464,29 @@ def verify_sync():
     
     try:
         import pandas as pd
+        import pyarrow.parquet as pq
         parquet_file = Path("feature_repo/data/aqi_features.parquet")
         
         if not parquet_file.exists():
             print("❌ No parquet file found after sync")
             return False
-            
-        df = pd.read_parquet(parquet_file)
+        
+        # Row count and timestamp range come from the parquet footer, so no
+        # column data is decoded; only files without statistics read timestamps
+        total_records = pq.ParquetFile(parquet_file).metadata.num_rows
+        timestamp_range = get_stored_timestamp_range()
+        if timestamp_range is None:
+            timestamps = pd.read_parquet(parquet_file, columns=['timestamp'])['timestamp']
+            timestamp_range = (timestamps.min(), timestamps.max())
+        earliest, latest = timestamp_range
+        
         print(f"✅ Data verification successful:")
-        print(f"   📊 Total records: {len(df)}")
-        print(f"   📅 Latest timestamp: {df['timestamp'].max()}")
-        print(f"   📅 Earliest timestamp: {df['timestamp'].min()}")
+        print(f"   📊 Total records: {total_records}")
+        print(f"   📅 Latest timestamp: {latest}")
+        print(f"   📅 Earliest timestamp: {earliest}")
         
         # Calculate data freshness
-        latest_time = pd.to_datetime(df['timestamp'].max())
+        latest_time = pd.to_datetime(latest)
         # Make now timezone-aware to match latest_time
         from datetime import timezone
         now = pd.Timestamp.now(timezone.utc)
@@ -380,14 +554,8 @@ def main():
     print("=" * 50)
     
     # Check if gh CLI is available
-    import platform
-    if platform.system() == "Windows":
-        gh_cmd = r"C:\Program Files\GitHub CLI\gh.exe"
-    else:
-        gh_cmd = "gh"
-        
     try:
-        subprocess.run([gh_cmd, "--version"], capture_output=True, check=True)
+        _run_gh("--version")
     except (subprocess.CalledProcessError, FileNotFoundError):
         print("❌ GitHub CLI (gh) not found!")
         print("📥 Install it from: https://cli.github.com/")
@@ -422,20 +590,30 @@ def main():
             print(f"❌ No completed runs found in the last {days_back} days")
             return
 
-        # Sort oldest → newest by createdAt
-        from datetime import timezone
-        completed_runs.sort(key=lambda r: datetime.fromisoformat(r["createdAt"].replace("Z", "+00:00")).astimezone(timezone.utc))
+        # Sort oldest → newest by createdAt; GitHub returns fixed-width UTC
+        # ISO strings ("...Z"), which already order chronologically as text
+        completed_runs.sort(key=lambda r: r["createdAt"])
 
         print(f"📦 Processing {len(completed_runs)} completed runs from last {days_back} days (oldest → newest)...")
-        processed = 0
-        for r in completed_runs:
-            print(f"— Processing run {r['number']} created at {r['createdAt']}")
-            if process_run(r):
-                processed += 1
-            else:
-                print(f"⚠️  Skipped run {r['number']} due to error")
+        new_tables = []
+        # Downloads are network-bound and run concurrently; tables are collected
+        # strictly oldest → newest (so newer data wins) and merged once at the end
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            downloads = [executor.submit(fetch_run, r) for r in completed_runs]
+            for r, download in zip(completed_runs, downloads):
+                tmp_dir = download.result()
+                print(f"— Processing run {r['number']} created at {r['createdAt']}")
+                table = collect_from_dir(tmp_dir) if tmp_dir is not None else None
+                if table is not None:
+                    new_tables.append(table)
+                else:
+                    print(f"⚠️  Skipped run {r['number']} due to error")
+                if tmp_dir is not None:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
 
-        print(f"✅ Processed {processed}/{len(completed_runs)} runs")
+        print(f"✅ Processed {len(new_tables)}/{len(completed_runs)} runs")
+        if new_tables and not finalize_merge(new_tables):
+            return
     else:
         # Single-run paths: latest or explicit run
         if not download_artifact(run_number, days_back):
@@ -0,0 +1,67 @@
+"""
+Tests for scripts/convert_csv_to_parquet.py, run as a script against a small BigQuery-style export
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "convert_csv_to_parquet.py"
+
+# Two hourly rows in BigQuery's export format ("... UTC" timestamps)
+EXPORT_CSV = """\
+timestamp,city,latitude,longitude,aqi,dominant_pollutant,pm25,dew,humidity,pressure,temp,wind_speed,hour,day,month,year,day_of_week,aqi_change,aqi_roll3,entity_id,feature_timestamp
+2025-10-12 14:00:00 UTC,Islamabad,33.7,73.1,152,pm25,152.0,12.0,40.0,1012.0,28.0,2.5,14,12,10,2025,6,3.0,150.0,2025-10-12T14:00:00,2025-10-12 14:00:00 UTC
+2025-10-12 15:00:00 UTC,Islamabad,33.7,73.1,158,pm25,158.0,12.5,42.0,1011.0,27.5,2.0,15,12,10,2025,6,6.0,154.3,2025-10-12T15:00:00,2025-10-12 15:00:00 UTC
+"""
+
+def run_convert(workdir):
+    """Run the conversion script from workdir and return its stdout"""
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT)],
+        cwd=workdir, capture_output=True, text=True, check=True
+    )
+    return result.stdout
+
+@pytest.fixture
+def workdir(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "exported data_aqi_features.csv").write_text(EXPORT_CSV)
+    return tmp_path
+
+def test_output_schema_matches_feature_view(workdir):
+    run_convert(workdir)
+    schema = pq.read_schema(workdir / "feature_repo" / "data" / "aqi_features.parquet")
+
+    assert schema.field("timestamp").type == pa.timestamp("ns", tz="UTC")
+    # Feast String fields stay strings even though they look like timestamps
+    for name in ("city", "dominant_pollutant", "entity_id", "feature_timestamp", "location_id"):
+        assert schema.field(name).type == pa.string(), name
+    for name in ("pm25", "latitude", "longitude", "aqi_change", "aqi_roll3"):
+        assert schema.field(name).type == pa.float32(), name
+
+def test_reimporting_the_same_export_keeps_the_file(workdir):
+    run_convert(workdir)
+    output = run_convert(workdir)
+
+    assert "No new or changed records in the CSV; keeping the existing file" in output
+
+def test_reimport_compares_against_the_stored_types(workdir):
+    run_convert(workdir)
+    # Rewrite the store with the types feast_utils appends (int32 time fields,
+    # microsecond timestamps); the same export must still count as unchanged
+    path = workdir / "feature_repo" / "data" / "aqi_features.parquet"
+    table = pq.read_table(path)
+    stored_types = {name: pa.int32() for name in ("aqi", "hour", "day", "month", "year", "day_of_week")}
+    stored_types["timestamp"] = pa.timestamp("us", tz="UTC")
+    pq.write_table(table.cast(pa.schema([
+        pa.field(field.name, stored_types.get(field.name, field.type)) for field in table.schema
+    ])), path)
+
+    output = run_convert(workdir)
+
+    assert "No new or changed records in the CSV; keeping the existing file" in output
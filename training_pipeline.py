@@ -6,6 +6,7 @@ Trains multiple models to predict AQI for 24h, 48h, and 72h ahead
 import pandas as pd
 import numpy as np
 import os
+import shutil
 import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -41,19 +42,19 @@ def load_data_from_feast():
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
         
-        # Use our Feast helper function
-        df = get_historical_features_for_training(start_date, end_date)
-        
-        if len(df) == 0:
-            print("⚠️  No data found in Feast for the specified date range")
-            return None
-        
         # Select relevant columns for training (same as before)
         training_columns = [
             'timestamp', 'hour', 'day_of_week', 'month', 'year',
             'temp', 'humidity', 'pressure', 'wind_speed', 'dew', 'pm25', 'aqi'
         ]
         
+        # Use our Feast helper function
+        df = get_historical_features_for_training(start_date, end_date, columns=training_columns)
+        
+        if len(df) == 0:
+            print("⚠️  No data found in Feast for the specified date range")
+            return None
+        
         # Check if all required columns exist
         missing_columns = [col for col in training_columns if col not in df.columns]
         if missing_columns:
@@ -456,13 +457,22 @@ def should_deploy_model(horizon, model_name, new_rmse):
         print(f"   Defaulting to: DEPLOY (safe fallback)")
         return True
 
+def deploy_file(src, dst):
+    """Copy src over dst atomically so readers never see a half-written file
+    
+    The API memory-maps the _latest.pkl models, so overwriting them in place
+    would corrupt the mapping of a running server; a rename swaps the inode.
+    """
+    tmp = f"{dst}.tmp"
+    shutil.copy(src, tmp)
+    os.replace(tmp, dst)
+
 def save_best_models(models, scalers, results_df, feature_columns):
     """Save best model for each horizon with versioning and smart deployment"""
     print("💾 Saving best models with versioning...")
     
     try:
         import json
-        import shutil
         
         # Create output directories
         Path(MODEL_OUTPUT_DIR).mkdir(exist_ok=True)
@@ -496,13 +506,14 @@ def save_best_models(models, scalers, results_df, feature_columns):
             versioned_filename = f"{MODEL_OUTPUT_DIR}/aqi_predictor_{horizon}_{best_model_name}_{version_timestamp}.pkl"
             
             # ALWAYS save versioned model (for history)
-            joblib.dump(models[horizon][best_model_name], versioned_filename)
+            # Uncompressed (compress=0) so the API can memory-map it
+            joblib.dump(models[horizon][best_model_name], versioned_filename, compress=0, protocol=5)
             print(f"✅ Saved versioned {horizon} model: {best_model_name} v{version_timestamp}")
             
             # Save scaler if exists (also versioned)
             if scalers[horizon].get(best_model_name) is not None:
                 versioned_scaler_filename = f"{MODEL_OUTPUT_DIR}/scaler_{horizon}_{best_model_name}_{version_timestamp}.pkl"
-                joblib.dump(scalers[horizon][best_model_name], versioned_scaler_filename)
+                joblib.dump(scalers[horizon][best_model_name], versioned_scaler_filename, protocol=5)
                 
                 # Also create _latest scaler
                 latest_scaler_filename = f"{MODEL_OUTPUT_DIR}/scaler_{horizon}_{best_model_name}_latest.pkl"
@@ -515,10 +526,10 @@ def save_best_models(models, scalers, results_df, feature_columns):
             
             if should_deploy:
                 # Deploy: Copy versioned model to _latest.pkl
-                shutil.copy(versioned_filename, latest_filename)
+                deploy_file(versioned_filename, latest_filename)
                 
                 if scalers[horizon].get(best_model_name) is not None:
-                    shutil.copy(versioned_scaler_filename, latest_scaler_filename)
+                    deploy_file(versioned_scaler_filename, latest_scaler_filename)
                 
                 deployment_info[horizon] = {
                     'deployed': True,
@@ -651,7 +662,7 @@ def save_evaluation_results(results_df):
     print("💾 Saving evaluation results...")
     
     try:
-        from performance_db import save_performance_result
+        from performance_db import save_performance_results
         
         Path(EVALUATION_OUTPUT_DIR).mkdir(exist_ok=True)
         
@@ -660,9 +671,9 @@ def save_evaluation_results(results_df):
         results_df.to_csv(results_filename, index=False)
         print(f"✅ Evaluation results saved: {results_filename}")
         
-        # Save to SQLite database
-        for _, row in results_df.iterrows():
-            result = {
+        # Save to SQLite database in a single transaction
+        results = [
+            {
                 'timestamp': row['timestamp'],
                 'horizon': row['horizon'],
                 'model': row['model'],
@@ -673,7 +684,9 @@ def save_evaluation_results(results_df):
                 'n_test_samples': int(row['n_test_samples']),
                 'deployed': 0  # Will be updated by deployment logic
             }
-            save_performance_result(result)
+            for row in results_df.to_dict(orient='records')
+        ]
+        save_performance_results(results)
         
         print(f"✅ Performance tracking saved to SQLite database")
         